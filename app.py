@@ -1,17 +1,57 @@
+import logging
 import os.path
 import sys
+import threading
 from datetime import datetime
 
 from PySide6.QtCore import *
-from PySide6.QtGui import QDesktopServices, QIcon
+from PySide6.QtGui import QAction, QDesktopServices, QIcon
 from PySide6.QtWidgets import *
 
-from crawlers.spider import DebugSpider
+from crawlers.page_archive import PageArchive
+from crawlers.parse_cache import ParseCache
+from crawlers.sink import OrderStoreSink
+from crawlers.spider import DebugSpider, SessionExpiredError, JD_RECENT, JD_THIS_YEAR
 from service.login import LoginWindow
+from service.analytics import SpendingAnalytics, COLUMNS as ANALYTICS_COLUMNS
+from service.order_store import OrderStore
+from service.storage import DATA_DIR
 from ui.ui_form import Ui_MainWindow
+from utils.category import CATEGORY_KEYWORDS, category_pattern
 from utils.convert import dict_list_to_2d_array
+from utils.export import export_csv, export_jsonl, export_xlsx, ExportCancelled
+from utils.log import add_handler, setup_logging
+from utils.worker import Worker
+from widget.logpanewidget import LogPaneWidget
+from widget.summarypanelwidget import SummaryPanelWidget
+from widget.styledtablewidget import EXPORT_ALL, EXPORT_SELECTED, EXPORT_FILTERED
 import resources_rc
 
+logger = logging.getLogger(__name__)
+
+# 表格各列对应的订单字段和表头
+TABLE_FIELDS = ['order_id', 'order_time', 'product_name', 'quantity', 'consignee', 'address', 'phone', 'amount',
+                'payment_method', 'status']
+TABLE_HEADERS = ['订单编号', '下单时间', '商品名称', '购买数量', '收货人', '收货地址', '联系电话', '实付金额（元）',
+                 '支付方式', '订单状态']
+
+# 列表页只解析界面用到的字段：表格（导出同表格列）和消费统计；
+# 详情补全、附件下载等需要更多字段的爬虫在各自运行时按需指定 fields
+CRAWL_FIELDS = sorted(set(TABLE_FIELDS) | set(ANALYTICS_COLUMNS))
+
+# 启动时先同步加载的订单数（约一屏），其余订单按 SNAPSHOT_CHUNK_ROWS 条一批在空闲时追加
+FIRST_SCREEN_ROWS = 50
+SNAPSHOT_CHUNK_ROWS = 1000
+
+# 启动后的后台同步只重爬近期分区（近三个月和今年内），更早的订单状态基本不再变化
+SYNC_PARTITIONS = [JD_RECENT, JD_THIS_YEAR]
+
+# 关闭窗口时最多等待后台爬取结束的时间（毫秒）
+SYNC_STOP_TIMEOUT_MS = 3000
+
+# 关闭窗口时未能及时结束的爬取线程，保留引用直到进程退出
+_detached_threads = []
+
 def load_data_to_table(tableWidget: QTableWidget, data):
     # 设置表格行列数
     tableWidget.setRowCount(len(data))
@@ -124,6 +164,34 @@ class MyMainWindow(QMainWindow):
 
         self.thread = None
 
+        # 本地订单库
+        self.order_store = OrderStore()
+
+        # 解析缓存，未变化的订单页不再重复解析
+        self.parse_cache = ParseCache()
+
+        # 原始页面归档，解析器更新后可用 python -m crawlers.reparse 离线回填
+        self.page_archive = PageArchive()
+
+        # 最近一次爬取的运行指标
+        self.metrics = None
+
+        # 日志面板（停靠在底部，默认隐藏，可从“文件”菜单打开）
+        self.log_pane = LogPaneWidget(self)
+        self.log_dock = QDockWidget("日志", self)
+        self.log_dock.setWidget(self.log_pane)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.log_dock)
+        self.log_dock.hide()
+        self.ui.menu.addAction(self.log_dock.toggleViewAction())
+
+        # 消费统计面板
+        self.analytics = SpendingAnalytics(self.order_store)
+        self.summary_panel = SummaryPanelWidget(self)
+        self.summary_dock = QDockWidget("消费统计", self)
+        self.summary_dock.setWidget(self.summary_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.summary_dock)
+        self.ui.menu.addAction(self.summary_dock.toggleViewAction())
+
         # 连接登录槽函数
         self.ui.pushButton.clicked.connect(self.login)
 
@@ -132,10 +200,20 @@ class MyMainWindow(QMainWindow):
 
         # 获取日期
         date = datetime.now().strftime("%Y-%m-%d")
-        desktop_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.DesktopLocation),
-                                    f"{date}-导出数据.csv")
+        self.export_dir = QStandardPaths.writableLocation(QStandardPaths.DesktopLocation)
+        self.export_basename = f"{date}-导出数据"
         # 连接导出槽函数
-        self.ui.action.triggered.connect(lambda: self.ui.tableWidget.export_to_csv(desktop_path))
+        self.ui.action.triggered.connect(self.export_csv_data)
+
+        # 导出 Excel
+        self.excel_action = QAction("导出Excel", self)
+        self.excel_action.triggered.connect(self.export_excel_data)
+        self.ui.menu.addAction(self.excel_action)
+
+        # 导出 JSON Lines
+        self.jsonl_action = QAction("导出JSON Lines", self)
+        self.jsonl_action.triggered.connect(self.export_jsonl_data)
+        self.ui.menu.addAction(self.jsonl_action)
 
         # 连接comboBox的信号
         self.ui.comboBox.currentTextChanged.connect(self.on_combo_box_changed)
@@ -144,6 +222,140 @@ class MyMainWindow(QMainWindow):
 
         self.ui.export_current_page.clicked.connect(self.export_current_page_data)
 
+        # 先展示本地订单，再在后台同步（消费统计在本地订单加载完后刷新）
+        self.sync_worker = None
+        self.sync_thread = None
+        self.sync_cancel = None
+        self.sync_since = None
+        self.sync_manual = False
+        self.crawl_spider = None
+        self.load_snapshot()
+
+    def refresh_summary(self):
+        """刷新消费统计（订单库未变化时直接使用缓存）"""
+        try:
+            self.summary_panel.show_summary(self.analytics.summary())
+        except Exception as e:
+            logger.error("消费统计失败: %s", e)
+
+    def start_worker(self, worker):
+        """在后台线程中运行 Worker，结束后自动回收线程"""
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(thread.deleteLater)
+        # 持有引用，防止线程运行期间被回收
+        self.thread = thread
+        self.worker = worker
+        thread.start()
+        return thread
+
+    def ask_export_rows(self):
+        """选择导出范围，返回 (表头, 数据行)，取消时返回 None"""
+        scopes = {"全部订单": EXPORT_ALL, "选中的订单": EXPORT_SELECTED, "筛选结果": EXPORT_FILTERED}
+        label, ok = QInputDialog.getItem(self, "导出", "导出范围:", list(scopes), 0, False)
+        if not ok:
+            return None
+
+        table = self.ui.tableWidget
+        rows = table.get_export_rows(scopes[label])
+        if not rows:
+            QMessageBox.information(self, "提示", "没有可导出的订单数据")
+            return None
+        return table.header_labels(), rows
+
+    def export_csv_data(self):
+        """后台导出 CSV，可查看进度和取消"""
+        selection = self.ask_export_rows()
+        if selection is None:
+            return
+        headers, rows = selection
+
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出CSV", os.path.join(self.export_dir, self.export_basename + ".csv"), "CSV 文件 (*.csv)")
+        if not filename:
+            return
+
+        cancel_event = threading.Event()
+        progress = QProgressDialog("正在导出...", "取消", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.canceled.connect(cancel_event.set)
+
+        worker = Worker(export_csv, filename, headers, rows,
+                        progress_callback=None, cancel_event=cancel_event)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(lambda count: self.on_export_finished(progress, count, filename))
+        worker.error.connect(lambda error: self.on_export_error(progress, error))
+        self.start_worker(worker)
+
+    def export_jsonl_data(self):
+        """后台导出 JSON Lines，每行一个订单"""
+        selection = self.ask_export_rows()
+        if selection is None:
+            return
+        _, rows = selection
+
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出JSON Lines", os.path.join(self.export_dir, self.export_basename + ".jsonl"),
+            "JSON Lines 文件 (*.jsonl)")
+        if not filename:
+            return
+
+        cancel_event = threading.Event()
+        progress = QProgressDialog("正在导出...", "取消", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.canceled.connect(cancel_event.set)
+
+        worker = Worker(export_jsonl, filename, TABLE_FIELDS, rows,
+                        progress_callback=None, cancel_event=cancel_event)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(lambda count: self.on_export_finished(progress, count, filename))
+        worker.error.connect(lambda error: self.on_export_error(progress, error))
+        self.start_worker(worker)
+
+    def export_excel_data(self):
+        """后台导出 Excel，可按月份分表"""
+        selection = self.ask_export_rows()
+        if selection is None:
+            return
+        headers, rows = selection
+
+        layouts = {"单个工作表": None, "按月份分表": 'month'}
+        label, ok = QInputDialog.getItem(self, "导出Excel", "工作表:", list(layouts), 0, False)
+        if not ok:
+            return
+
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出Excel", os.path.join(self.export_dir, self.export_basename + ".xlsx"), "Excel 文件 (*.xlsx)")
+        if not filename:
+            return
+
+        cancel_event = threading.Event()
+        progress = QProgressDialog("正在导出...", "取消", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.canceled.connect(cancel_event.set)
+
+        worker = Worker(export_xlsx, filename, TABLE_FIELDS, headers, rows, sheet_by=layouts[label],
+                        progress_callback=None, cancel_event=cancel_event)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(lambda count: self.on_export_finished(progress, count, filename))
+        worker.error.connect(lambda error: self.on_export_error(progress, error))
+        self.start_worker(worker)
+
+    def on_export_finished(self, progress, count, filename):
+        progress.close()
+        self.statusBar().showMessage(f"已导出 {count} 条订单到 {filename}", 5000)
+
+    def on_export_error(self, progress, error):
+        progress.close()
+        error_type, message = error
+        if error_type is ExportCancelled:
+            self.statusBar().showMessage("导出已取消", 3000)
+        else:
+            QMessageBox.warning(self, "导出失败", message)
+
     def export_current_page_data(self):
         """导出当前页可见的订单数据"""
         # 获取当前页所有可见行的数据
@@ -198,141 +410,12 @@ class MyMainWindow(QMainWindow):
 
     def on_combo_box_changed(self, text):
         """处理comboBox选择变化"""
-        if text == "电脑配件":
-            self.filter_computer_accessories()
-        elif text == "手机数码":
-            self.filter_phone_digital()
-        elif text == "家用电器":
-            self.filter_home_appliances()
-        elif text == "服装鞋帽":
-            self.filter_clothing_shoes()
-        elif text == "食品饮料":
-            self.filter_food_beverage()
-        elif text == "美妆个护":
-            self.filter_beauty_care()
-        elif text == "图书文具":
-            self.filter_books_stationery()
-        elif text == "运动户外":
-            self.filter_sports_outdoor()
-        elif text == "家居日用":
-            self.filter_home_daily()
-        elif text == "母婴玩具":
-            self.filter_baby_toys()
+        if text in CATEGORY_KEYWORDS:
+            self._apply_filter_by_product_name(category_pattern(text))
         else:
             # 如果选择其他选项，清除筛选
             self.ui.tableWidget.clear_filter()
 
-    def filter_computer_accessories(self):
-        """筛选电脑配件订单"""
-        computer_keywords = [
-            r'电脑|计算机', r'笔记本|台式机', r'CPU|处理器', r'显卡|GPU',
-            r'内存|RAM', r'硬盘|固态|SSD|HDD', r'主板|主板芯片', r'电源|电源供应器',
-            r'机箱|电脑机箱', r'散热器|风扇|水冷', r'显示器|液晶屏', r'键鼠|键盘|鼠标',
-            r'音响|耳机|音箱', r'网卡|路由器|交换机', r'摄像头|麦克风', r'USB|接口|扩展',
-            r'光驱|刻录机'
-        ]
-        pattern = '|'.join(computer_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_phone_digital(self):
-        """筛选手机数码订单"""
-        phone_keywords = [
-            r'手机|智能手机', r'iPhone|安卓', r'平板|iPad', r'智能手表|手环',
-            r'耳机|耳麦|蓝牙耳机', r'充电宝|移动电源', r'数据线|充电器', r'手机壳|保护套',
-            r'贴膜|屏幕保护膜', r'相机|摄像机|单反', r'镜头|摄影器材', r'自拍杆|三脚架',
-            r'存储卡|SD卡|TF卡', r'读卡器|转接头', r'智能家居|智能设备'
-        ]
-        pattern = '|'.join(phone_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_home_appliances(self):
-        """筛选家用电器订单"""
-        appliance_keywords = [
-            r'电视|电视机|液晶电视', r'冰箱|冷藏柜', r'洗衣机|烘干机', r'空调|空调器',
-            r'热水器|电热水器', r'微波炉|烤箱|电磁炉', r'电饭煲|电压力锅', r'吸尘器|扫地机',
-            r'电风扇|空气净化器', r'饮水机|净水器', r'榨汁机|料理机', r'电熨斗|挂烫机',
-            r'剃须刀|电动牙刷', r'电吹风|美发器', r'加湿器|除湿机'
-        ]
-        pattern = '|'.join(appliance_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_clothing_shoes(self):
-        """筛选服装鞋帽订单"""
-        clothing_keywords = [
-            r'衬衫|T恤|毛衣', r'外套|夹克|风衣', r'裤子|长裤|短裤', r'裙子|连衣裙',
-            r'内衣|内裤|文胸', r'袜子|丝袜', r'运动服|休闲服', r'西装|正装',
-            r'羽绒服|棉服', r'泳装|泳衣', r'鞋子|运动鞋', r'皮鞋|凉鞋|拖鞋',
-            r'帽子|鸭舌帽', r'围巾|手套', r'皮带|腰带'
-        ]
-        pattern = '|'.join(clothing_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_food_beverage(self):
-        """筛选食品饮料订单"""
-        food_keywords = [
-            r'零食|小吃|饼干', r'巧克力|糖果', r'坚果|炒货', r'饮料|果汁|矿泉水',
-            r'咖啡|茶叶', r'牛奶|酸奶', r'方便面|速食', r'米面|粮油',
-            r'调味品|酱油|醋', r'生鲜|水果|蔬菜', r'肉类|海鲜', r'面包|糕点',
-            r'酒类|啤酒|白酒', r'保健品|营养品', r'婴儿食品|奶粉'
-        ]
-        pattern = '|'.join(food_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_beauty_care(self):
-        """筛选美妆个护订单"""
-        beauty_keywords = [
-            r'化妆品|彩妆', r'护肤品|面膜', r'洗面奶|洁面乳', r'香水|香氛',
-            r'口红|唇膏', r'眼影|眉笔', r'粉底|BB霜', r'洗发水|护发素',
-            r'沐浴露|身体乳', r'牙膏|牙刷', r'剃须|脱毛', r'防晒|隔离',
-            r'美容仪|按摩器', r'化妆棉|棉签', r'精油|香薰'
-        ]
-        pattern = '|'.join(beauty_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_books_stationery(self):
-        """筛选图书文具订单"""
-        book_keywords = [
-            r'图书|书籍', r'小说|文学', r'教材|教辅', r'儿童图书|绘本',
-            r'杂志|期刊', r'笔记本|记事本', r'笔|钢笔|圆珠笔', r'文具盒|笔袋',
-            r'橡皮|尺子', r'书包|文具包', r'文件袋|文件夹', r'胶水|胶带',
-            r'订书机|打孔机', r'计算器|办公用品', r'画材|美术用品'
-        ]
-        pattern = '|'.join(book_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_sports_outdoor(self):
-        """筛选运动户外订单"""
-        sports_keywords = [
-            r'运动鞋|跑鞋', r'运动服|健身服', r'篮球|足球|排球', r'球拍|网球拍',
-            r'健身器材|哑铃', r'瑜伽垫|瑜伽服', r'自行车|骑行', r'帐篷|睡袋',
-            r'登山包|户外装备', r'钓鱼|渔具', r'游泳|泳镜', r'滑雪|滑板',
-            r'轮滑|溜冰鞋', r'护具|运动保护', r'户外服装|冲锋衣'
-        ]
-        pattern = '|'.join(sports_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_home_daily(self):
-        """筛选家居日用订单"""
-        home_keywords = [
-            r'家具|沙发|椅子', r'床上用品|床单', r'窗帘|布艺', r'厨具|锅具',
-            r'餐具|碗筷', r'清洁用品|洗衣液', r'收纳|整理箱', r'装饰品|摆件',
-            r'灯具|台灯', r'地毯|地垫', r'钟表|闹钟', r'镜子|梳妆台',
-            r'毛巾|浴巾', r'雨伞|雨具', r'家居服|拖鞋'
-        ]
-        pattern = '|'.join(home_keywords)
-        self._apply_filter_by_product_name(pattern)
-
-    def filter_baby_toys(self):
-        """筛选母婴玩具订单"""
-        baby_keywords = [
-            r'婴儿服装|童装', r'尿不湿|纸尿裤', r'奶粉|奶瓶', r'婴儿车|婴儿床',
-            r'玩具|积木', r'娃娃|玩偶', r'模型|拼装', r'电动玩具|遥控',
-            r'益智玩具|早教', r'滑板车|自行车', r'婴儿食品|辅食', r'孕产妇用品',
-            r'儿童座椅|安全', r'洗护用品|婴儿', r'书包|文具'
-        ]
-        pattern = '|'.join(baby_keywords)
-        self._apply_filter_by_product_name(pattern)
-
     def _apply_filter_by_product_name(self, pattern):
         """通用的按商品名称筛选方法"""
         # 查找商品名称列
@@ -355,35 +438,198 @@ class MyMainWindow(QMainWindow):
                     return col
         return -1
 
+    def on_session_expired(self):
+        """登录失效时提示重新登录"""
+        self.statusBar().showMessage("京东登录已失效", 5000)
+        reply = QMessageBox.question(self, "登录失效", "京东登录已失效，是否现在重新登录？")
+        if reply == QMessageBox.Yes:
+            self.login()
+
     def login(self):
         self.login_window = LoginWindow("https://order.jd.com/center/list.action")
         self.login_window.show()
 
 
 
+    def load_snapshot(self):
+        """
+        启动时展示订单库中上次保存的订单：第一屏同步加载，窗口显示后即可看到，
+        其余订单在事件循环空闲时分批追加；加载完成后在后台增量同步
+        """
+        table = self.ui.tableWidget
+        table.set_column_headers(TABLE_HEADERS)
+        self.snapshot_offset = 0
+        self.snapshot_loading = True
+        self._load_snapshot_chunk(FIRST_SCREEN_ROWS)
+
+    def _load_snapshot_chunk(self, limit, sync=True):
+        """
+        加载下一批快照订单
+
+        Args:
+            limit: 本批条数
+            sync: 全部加载完后是否启动后台同步
+        """
+        if not self.snapshot_loading:
+            return
+        orders = self.order_store.recent(limit, self.snapshot_offset)
+        self.ui.tableWidget.append_rows(dict_list_to_2d_array(orders, keys=TABLE_FIELDS))
+        self.snapshot_offset += len(orders)
+        if len(orders) == limit:
+            QTimer.singleShot(0, lambda: self._load_snapshot_chunk(SNAPSHOT_CHUNK_ROWS))
+            return
+        self.snapshot_loading = False
+        logger.info("已加载本地订单 %d 条", self.snapshot_offset)
+        self.refresh_summary()
+        # 本地没有订单时（首次使用，可能尚未登录）等用户手动刷新
+        if sync and self.snapshot_offset:
+            self.start_background_sync()
+
+    def finish_snapshot(self):
+        """立即加载快照中剩余的订单；调用方随后自行爬取，不再启动后台同步"""
+        while self.snapshot_loading:
+            self._load_snapshot_chunk(SNAPSHOT_CHUNK_ROWS, sync=False)
+
+    def start_crawl(self, since=None, partitions=None, manual=False):
+        """
+        在后台线程中爬取订单，结果在界面线程中合并进表格；启动时的自动同步和手动刷新共用
+
+        Args:
+            since: 见 crawl_jd_orders
+            partitions: 要爬取的时间分区，默认全部历史
+            manual: 是否为用户手动刷新（登录失效时弹窗提示）
+
+        Returns:
+            是否启动了爬取（已有爬取在进行时返回 False）
+        """
+        if self.sync_worker is not None:
+            return False
+        self.sync_since = since
+        self.sync_manual = manual
+        self.sync_cancel = threading.Event()
+        worker = Worker(self.crawl_jd_orders, since, partitions, cancel_event=self.sync_cancel)
+        # 连接到窗口的方法，结果在界面线程中处理
+        worker.finished.connect(self.on_sync_finished)
+        worker.error.connect(self.on_sync_error)
+        # 与导出共用 start_worker，单独持有引用，避免爬取期间被回收
+        self.sync_worker = worker
+        self.sync_thread = self.start_worker(worker)
+        self.ui.button_flush.setEnabled(False)
+        return True
+
+    def start_background_sync(self):
+        """在后台重新爬取最近的分区，只把有变化的订单合并进表格"""
+        if self.start_crawl(self.order_store.version()[1], SYNC_PARTITIONS):
+            self.statusBar().showMessage("正在后台同步最近的订单...")
+
+    def stop_background_sync(self, timeout_ms=SYNC_STOP_TIMEOUT_MS):
+        """
+        停止正在进行的爬取：不再发出新请求并关闭会话，最多等待 timeout_ms 毫秒，
+        已爬取的订单照常写入订单库
+        """
+        if self.sync_worker is None:
+            return
+        self.sync_cancel.set()
+        # 窗口关闭后不再处理爬取结果
+        self.sync_worker.finished.disconnect(self.on_sync_finished)
+        self.sync_worker.error.disconnect(self.on_sync_error)
+        if self.crawl_spider is not None:
+            self.crawl_spider.session.close()
+        self.sync_thread.quit()
+        if not self.sync_thread.wait(timeout_ms):
+            # 线程仍在等待网络请求：与窗口解除父子关系并保留引用，避免随窗口销毁正在运行的线程
+            logger.warning("后台爬取未在 %d 毫秒内结束，退出时不再等待", timeout_ms)
+            self.sync_thread.setParent(None)
+            _detached_threads.append((self.sync_thread, self.sync_worker))
+        self.sync_worker = None
+
+    def closeEvent(self, event):
+        self.snapshot_loading = False
+        self.stop_background_sync()
+        super().closeEvent(event)
+
+    def on_sync_finished(self, data):
+        self.sync_worker = None
+        self.ui.button_flush.setEnabled(True)
+        self.show_crawl_result(data, self.sync_since)
+
+    def on_sync_error(self, error):
+        self.sync_worker = None
+        self.ui.button_flush.setEnabled(True)
+        error_type, message = error
+        if error_type is SessionExpiredError:
+            if self.sync_manual:
+                self.on_session_expired()
+            else:
+                # 启动时不弹窗打扰，显示本地订单即可
+                self.statusBar().showMessage("京东登录已失效，当前显示的是本地订单", 10000)
+        elif self.sync_manual:
+            logger.error("爬取失败: %s", message)
+            QMessageBox.warning(self, "爬取失败", message)
+        else:
+            logger.error("后台同步失败: %s", message)
+            self.statusBar().showMessage("后台同步失败，当前显示的是本地订单", 10000)
+
     def button_flush_func(self):
         '''
         刷新数据
         '''
+        self.finish_snapshot()
+        if self.sync_worker is not None:
+            self.statusBar().showMessage("正在后台同步订单，请稍候", 3000)
+            return
 
+        # 表格为空时展示订单库的全部订单，否则只更新本次有变化的订单
+        since = self.order_store.version()[1] if self.ui.tableWidget.rowCount() else None
+        self.start_crawl(since, manual=True)
+        self.statusBar().showMessage("正在爬取京东订单...")
 
-        data = self.crawl_jd_orders()
+    def show_crawl_result(self, data, since=None):
+        """
+        把爬取结果展示到表格
+
+        Args:
+            data: crawl_jd_orders 返回的订单
+            since: 为 None 时 data 是全部订单，重新加载表格；否则只合并有变化的订单
+        """
+        self.finish_snapshot()
+        table = self.ui.tableWidget
         # 转换数据
-        data = dict_list_to_2d_array(data, exclude_keys=["order_url", "shop_name", "product_url"])
+        data = dict_list_to_2d_array(data, keys=TABLE_FIELDS)
 
         # 加载数据到表格
-        load_data_to_table(self.ui.tableWidget, data)
-        header = ['订单编号', '下单时间', '商品名称', '购买数量', '收货人', '收货地址', '联系电话', '实付金额（元）',
-                  '支付方式', '订单状态']
-        self.ui.tableWidget.setHorizontalHeaderLabels(header)
-
-        self.statusBar().showMessage("京东订单爬取完成", 3000)
-
-
-
-    def crawl_jd_orders(self):
-        """执行京东订单爬取的实际函数"""
-        debug_spider = DebugSpider()
+        with self.metrics.stage('render'):
+            if since is None:
+                if data:
+                    load_data_to_table(table, data)
+                table.set_source_rows(data)
+            else:
+                updated, inserted = table.upsert_rows(data, TABLE_FIELDS.index('order_id'))
+                logger.info("表格更新 %d 行，新增 %d 行", updated, inserted)
+        table.setHorizontalHeaderLabels(TABLE_HEADERS)
+
+        try:
+            self.metrics.export(os.path.join(DATA_DIR, "metrics", "jd_orders.prom"))
+        except OSError as e:
+            logger.error("指标导出失败: %s", e)
+
+        self.refresh_summary()
+        self.statusBar().showMessage(f"京东订单爬取完成：{self.metrics.summary()}", 10000)
+
+    def crawl_jd_orders(self, since=None, partitions=None, cancel_event=None):
+        """
+        执行京东订单爬取的实际函数
+
+        Args:
+            since: 订单库时间戳，指定时只返回此后内容有变化的订单，否则返回全部订单
+            partitions: 要爬取的时间分区，默认全部历史
+            cancel_event: 置位后停止翻页（如关闭窗口时）
+        """
+        debug_spider = DebugSpider(parse_cache=self.parse_cache, page_archive=self.page_archive,
+                                   fields=CRAWL_FIELDS, cancel_event=cancel_event)
+        self.metrics = debug_spider.metrics
+        # 关闭窗口时用于关闭会话
+        self.crawl_spider = debug_spider
         debug_spider.set_headers({
             "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
             "accept-language": "zh-CN,zh;q=0.9,en;q=0.8",
@@ -403,9 +649,14 @@ class MyMainWindow(QMainWindow):
         base_url = 'https://order.jd.com/center/list.action'
         params = {"page": 1}
 
-        # 使用支持进度回调的版本
-        data = debug_spider.crawl_all_pages(base_url, method='POST', params=params)
-        return data
+        # 按年份分区并发爬取，每个分区的翻页链互相独立；订单边爬取边分批写入本地订单库
+        with OrderStoreSink(self.order_store) as sink:
+            summary = debug_spider.crawl_partitioned(base_url, partitions, method='POST', params=params, sink=sink)
+        logger.info("京东订单写入订单库（内容未变的订单不写入）: %s", summary)
+
+        if since is None:
+            return self.order_store.all()
+        return self.order_store.updated_since(since)
 
     def share_order_data(self):
         """分享订单数据"""
@@ -477,7 +728,10 @@ def main():
 
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon("./resources/images/京东.svg"))
+    # 先初始化日志，窗口创建期间（加载本地订单、启动后台同步等）的日志也能写入文件
+    setup_logging(logging.INFO)
     window = MyMainWindow()
+    add_handler(window.log_pane.handler)
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,98 @@
+import glob
+import os
+import random
+from typing import List
+
+
+SHOPS = ['京东自营', 'Apple产品京东自营旗舰店', '小米京东自营旗舰店', '罗技京东自营官方旗舰店', '三只松鼠官方旗舰店']
+PRODUCTS = ['罗技 MX Master 3S 无线鼠标', 'Apple iPhone 15 128GB', '小米 充电宝 20000mAh', '三只松鼠 坚果礼盒',
+            '金士顿 固态硬盘 1TB', '美的 电饭煲 4L', '李宁 运动鞋 男款', '得力 中性笔 12支装']
+STATUSES = ['已完成', '已取消', '等待收货', '正在出库', '已签收']
+PAYMENTS = ['在线支付', '货到付款', '京东白条']
+
+ORDER_TEMPLATE = """
+<tbody id="tb-{order_id}">
+  <tr class="tr-th">
+    <td colspan="5">
+      <span class="gap"></span>
+      <span class="dealtime" title="{order_time}">{order_time}</span>
+      <span class="number">订单号：<a name="orderIdLinks" href="//details.jd.com/normal/item.action?orderid={order_id}" target="_blank">{order_id}</a></span>
+      <div class="tr-operate"><span class="order-shop"><a class="shop-txt" href="//mall.jd.com/index-1000.html">{shop}</a></span></div>
+    </td>
+  </tr>
+  <tr class="tr-bd">
+    <td>
+      <div class="goods-item p-{sku}">
+        <div class="p-img"><a href="//item.jd.com/{sku}.html"><img src="//img10.360buyimg.com/N6/s60x60_jfs/{sku}.jpg" data-lazy-img="//img10.360buyimg.com/N6/s60x60_jfs/{sku}.jpg"></a></div>
+        <div class="p-msg"><div class="p-name"><a class="a-link" href="//item.jd.com/{sku}.html" title="{product}">{product}</a></div></div>
+      </div>
+      <div class="goods-number">x{quantity}</div>
+    </td>
+    <td>
+      <div class="consignee tooltip">
+        <span class="txt">张*</span>
+        <div class="prompt-01 prompt-02"><div class="pc"><strong>张*</strong><p>北京市朝阳区某某街道{n}号</p><p>138****{phone}</p></div></div>
+      </div>
+    </td>
+    <td><div class="amount"><span>总额 ¥{amount}</span><br><span class="ftx-13">{payment}</span></div></td>
+    <td><div class="status"><span class="order-status">{status}</span></div></td>
+    <td><div class="operate"><a href="//details.jd.com/normal/item.action?orderid={order_id}">订单详情</a><a href="//myivc.jd.com/fpzz/index.action?orderId={order_id}">查看发票</a></div></td>
+  </tr>
+</tbody>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>我的订单</title></head>
+<body><div id="order02"><table class="td-void order-tb">{orders}</table></div></body></html>
+"""
+
+
+def make_order_html(n: int, rng: random.Random) -> str:
+    """生成单个订单的 tbody"""
+    sku = 100000000 + rng.randrange(2000)  # 商品有限，模拟重复购买
+    return ORDER_TEMPLATE.format(
+        order_id=300000000000 + n,
+        order_time=f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                   f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+        shop=rng.choice(SHOPS),
+        sku=sku,
+        product=rng.choice(PRODUCTS),
+        quantity=rng.randint(1, 5),
+        n=n,
+        phone=f"{rng.randint(0, 9999):04d}",
+        amount=f"{rng.uniform(1, 9999):.2f}",
+        payment=rng.choice(PAYMENTS),
+        status=rng.choice(STATUSES),
+    )
+
+
+def make_page(orders_per_page: int, start: int = 0, seed: int = 0) -> str:
+    """生成一页订单列表 HTML"""
+    rng = random.Random(seed + start)
+    orders = "".join(make_order_html(start + i, rng) for i in range(orders_per_page))
+    return PAGE_TEMPLATE.format(orders=orders)
+
+
+def make_corpus(total_orders: int, page_size: int = 10, seed: int = 0) -> List[str]:
+    """
+    生成完整的分页订单列表，最后追加一个空页作为结束标志
+
+    Args:
+        total_orders: 订单总数
+        page_size: 每页订单数
+        seed: 随机种子，保证结果可复现
+    """
+    pages = []
+    for start in range(0, total_orders, page_size):
+        pages.append(make_page(min(page_size, total_orders - start), start, seed))
+    pages.append(PAGE_TEMPLATE.format(orders=""))
+    return pages
+
+
+def load_recorded_corpus(directory: str) -> List[str]:
+    """读取录制的真实页面（按文件名排序的 *.html）"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    return pages
@@ -0,0 +1,184 @@
+import http.client
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List
+from urllib.parse import urlparse, parse_qs
+
+
+class MockJDServer:
+    """
+    本地模拟的京东订单列表服务
+    按 page 参数返回预先准备的页面，可配置延迟和错误率
+    """
+
+    def __init__(self, pages: List[str], latency: float = 0.0, error_rate: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        """
+        Args:
+            pages: 分页 HTML，pages[0] 对应 page=1
+            latency: 每个请求的固定延迟（秒）
+            error_rate: 返回 503 的概率
+            port: 监听端口，0 表示随机空闲端口
+        """
+        self.pages = [page.encode('utf-8') for page in pages]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                with server._lock:
+                    server.request_count += 1
+                    fail = server.rng.random() < server.error_rate
+
+                if server.latency > 0:
+                    time.sleep(server.latency)
+
+                if fail:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get('page', ['1'])[0])
+                # 超出范围返回最后一页（空页）
+                body = server.pages[min(max(page, 1), len(server.pages)) - 1]
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._serve()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                self._serve()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """订单列表地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/center/list.action"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class MockProxy:
+    """
+    本地模拟的 HTTP 转发代理，用于测试代理池
+    只转发 http 请求，可配置延迟和失败率（失败时返回 502）
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _forward(self, method):
+                with proxy._lock:
+                    proxy.request_count += 1
+                    fail = proxy.rng.random() < proxy.error_rate
+
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+
+                if proxy.latency > 0:
+                    time.sleep(proxy.latency)
+
+                if fail:
+                    self.send_response(502)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                target = urlparse(self.path)
+                headers = {k: v for k, v in self.headers.items()
+                           if k.lower() not in ('proxy-connection', 'connection', 'host')}
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+                try:
+                    path = target.path + ('?' + target.query if target.query else '')
+                    conn.request(method, path or '/', body=body, headers=headers)
+                    upstream = conn.getresponse()
+                    data = upstream.read()
+                finally:
+                    conn.close()
+
+                self.send_response(upstream.status)
+                for key, value in upstream.getheaders():
+                    if key.lower() not in ('transfer-encoding', 'connection', 'content-length'):
+                        self.send_header(key, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._forward('GET')
+
+            def do_POST(self):
+                self._forward('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """代理地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
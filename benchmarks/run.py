@@ -0,0 +1,166 @@
+"""
+离线性能基准
+
+用法:
+    python -m benchmarks.run
+    python -m benchmarks.run --orders 5000 --latency 0.05 --error-rate 0.05 --output bench_output.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.corpus import make_corpus, make_page, load_recorded_corpus
+from benchmarks.mock_server import MockJDServer
+from crawlers.spider import DebugSpider, jd_parse_order
+from service.order_store import OrderStore
+
+
+def timeit(func, repeat: int = 3):
+    """返回多次执行中的最短耗时和最后一次的结果"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_fetch(pages, latency, error_rate, workers):
+    """抓取吞吐：顺序翻页与并发请求"""
+    results = {}
+    with MockJDServer(pages, latency=latency, error_rate=error_rate) as server:
+        spider = DebugSpider(max_workers=workers)
+        start = time.perf_counter()
+        data = spider.crawl_all_pages(server.url, method='POST', params={"page": 1})
+        elapsed = time.perf_counter() - start
+        results['sequential'] = {
+            'seconds': round(elapsed, 4),
+            'pages': spider.stats['success_requests'],
+            'orders': len(data),
+            'pages_per_second': round(spider.stats['success_requests'] / elapsed, 2),
+        }
+
+        spider = DebugSpider(max_workers=workers)
+        urls = [f"{server.url}?page={i}" for i in range(1, len(pages) + 1)]
+        start = time.perf_counter()
+        ok = sum(1 for _, response in spider.request_many(urls) if response is not None)
+        elapsed = time.perf_counter() - start
+        results['concurrent'] = {
+            'seconds': round(elapsed, 4),
+            'pages': ok,
+            'workers': workers,
+            'pages_per_second': round(ok / elapsed, 2),
+        }
+    return results
+
+
+def bench_parse(sizes, fields=None):
+    """解析速度：不同大小的订单列表页，fields 为需要解析的字段（None 表示全部）"""
+    results = {}
+    for size in sizes:
+        response = SimpleNamespace(text=make_page(size))
+        seconds, orders = timeit(lambda: jd_parse_order(response, fields))
+        results[str(size)] = {
+            'seconds': round(seconds, 4),
+            'orders': len(orders),
+            'orders_per_second': round(len(orders) / seconds, 1),
+            'bytes': len(response.text.encode('utf-8')),
+        }
+    return results
+
+
+def parse_corpus(pages):
+    orders = []
+    for page in pages:
+        orders.extend(jd_parse_order(SimpleNamespace(text=page)))
+    return orders
+
+
+def bench_storage(orders):
+    """存储写入速度"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OrderStore(os.path.join(tmp, "orders.db"))
+        start = time.perf_counter()
+        store.upsert_many(orders)
+        first = time.perf_counter() - start
+
+        # 内容未变的重复写入，按哈希跳过
+        start = time.perf_counter()
+        rewritten = store.upsert_many(orders)
+        second = time.perf_counter() - start
+        store.close()
+    return {
+        'orders': len(orders),
+        'insert_seconds': round(first, 4),
+        'update_seconds': round(second, 4),
+        'rewritten': rewritten,
+        'orders_per_second': round(len(orders) / first, 1) if first else None,
+    }
+
+
+def bench_table(orders):
+    """表格加载耗时，需要 PySide6 和生成的 ui/ui_form.py"""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication, QTableWidget
+        from app import load_data_to_table, TABLE_FIELDS
+        from utils.convert import dict_list_to_2d_array
+    except ImportError as e:
+        return {'skipped': str(e)}
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    table = QTableWidget()
+    data = dict_list_to_2d_array(orders, keys=TABLE_FIELDS)
+    seconds, _ = timeit(lambda: load_data_to_table(table, data))
+    return {'rows': len(data), 'seconds': round(seconds, 4)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="京东订单爬虫离线基准")
+    parser.add_argument('--orders', type=int, default=1000, help="合成语料的订单总数")
+    parser.add_argument('--page-size', type=int, default=10, help="每页订单数")
+    parser.add_argument('--parse-sizes', default="10,100,1000,5000", help="解析基准的单页订单数")
+    parser.add_argument('--parse-fields', default="order_id,order_time,amount,status",
+                        help="投影解析基准只提取的字段，逗号分隔")
+    parser.add_argument('--latency', type=float, default=0.01, help="模拟服务的响应延迟（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="模拟服务返回 503 的概率")
+    parser.add_argument('--workers', type=int, default=8, help="并发抓取线程数")
+    parser.add_argument('--corpus-dir', help="使用录制的真实页面代替合成语料")
+    parser.add_argument('--output', help="结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    # 基准输出只关心结果，爬虫日志只保留警告
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.corpus_dir:
+        pages = load_recorded_corpus(args.corpus_dir)
+    else:
+        pages = make_corpus(args.orders, args.page_size)
+
+    orders = parse_corpus(pages)
+    parse_sizes = [int(s) for s in args.parse_sizes.split(',') if s]
+    results = {
+        'config': vars(args),
+        'fetch': bench_fetch(pages, args.latency, args.error_rate, args.workers),
+        'parse': bench_parse(parse_sizes),
+        'parse_projected': bench_parse(parse_sizes, [s for s in args.parse_fields.split(',') if s]),
+        'storage': bench_storage(orders),
+        'table': bench_table(orders),
+    }
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
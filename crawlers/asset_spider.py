@@ -0,0 +1,105 @@
+# asset_spider.py
+
+import mimetypes
+import os
+from collections import defaultdict
+from typing import List, Dict, Any
+from urllib.parse import urlparse
+
+import requests
+
+from crawlers.base_spider import SimpleSpider
+from crawlers.scheduler import PRIORITY_ASSET
+from crawlers.spider import JD_LOGIN_HOSTS, JD_LOGIN_MARKERS
+from service.asset_store import AssetStore
+
+
+class AssetSpider(SimpleSpider):
+    """批量下载订单附件（商品图片、发票），按内容哈希去重保存"""
+
+    priority = PRIORITY_ASSET
+    # 登录失效时附件地址会跳转到登录页，不能把登录页当作附件保存
+    login_hosts = JD_LOGIN_HOSTS
+    login_markers = JD_LOGIN_MARKERS
+
+    # 订单字段 -> 附件类型
+    ASSET_FIELDS = {
+        'product_image': 'image',
+        'invoice_url': 'invoice',
+    }
+
+    def __init__(self, store: AssetStore = None, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store or AssetStore()
+
+    def derive_asset_urls(self, order: Dict[str, Any]) -> Dict[str, str]:
+        """
+        从解析后的订单中提取附件URL
+
+        Returns:
+            {附件类型: url}
+        """
+        urls = {}
+        for field, kind in self.ASSET_FIELDS.items():
+            url = order.get(field)
+            if url:
+                urls[kind] = url
+        return urls
+
+    def _guess_ext(self, response: requests.Response) -> str:
+        """根据 Content-Type 或 URL 推断扩展名"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        ext = mimetypes.guess_extension(content_type) if content_type else None
+        if not ext:
+            ext = os.path.splitext(urlparse(response.url).path)[1]
+        return ext or ""
+
+    def parse(self, response: requests.Response) -> List[Dict[str, Any]]:
+        """保存响应内容到附件存储"""
+        digest = self.store.put(response.url, response.content, self._guess_ext(response))
+        return [{'url': response.url, 'hash': digest}]
+
+    def fetch_assets(self, orders: List[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+        """
+        下载订单的所有附件
+
+        Args:
+            orders: jd_parse_order 解析出的订单列表
+
+        Returns:
+            {order_id: {附件类型: 内容哈希}}
+        """
+        self.before_start()
+
+        # url -> [(order_id, kind)]，同一商品图片只下载一次
+        url_refs = defaultdict(list)
+        for order in orders:
+            order_id = order.get('order_id')
+            if not order_id:
+                continue
+            for kind, url in self.derive_asset_urls(order).items():
+                url_refs[url].append((order_id, kind))
+
+        pending = [url for url in url_refs if not self.store.has_url(url)]
+        self.logger.info("共 %d 个附件，需下载 %d 个", len(url_refs), len(pending))
+
+        downloaded = []
+        for url, response in self.request_many(pending):
+            if response is None:
+                continue
+            try:
+                # 记录请求时的URL，重定向后的地址可能不同
+                digest = self.store.put(url, response.content, self._guess_ext(response))
+                downloaded.append({'url': url, 'hash': digest})
+            except OSError as e:
+                self.logger.error("附件保存失败 %s: %s", url, e)
+
+        for url, refs in url_refs.items():
+            for order_id, kind in refs:
+                self.store.link(order_id, kind, url)
+        self.store.save()
+
+        self.after_finish(downloaded)
+
+        return {order_id: self.store.get_order_assets(order_id)
+                for order_id in {ref[0] for refs in url_refs.values() for ref in refs}}
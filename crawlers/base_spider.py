@@ -1,11 +1,65 @@
 import time
-import json
+import logging
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
-from urllib.parse import urljoin
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple, Iterable
+from urllib.parse import urljoin, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 
-from service.storage import cookie
+from crawlers.circuit_breaker import CircuitBreaker
+from crawlers.concurrency import AdaptiveConcurrency
+from crawlers.fingerprint import SeenSet, SingleFlight, request_fingerprint, session_identity, \
+    single_flight as default_single_flight
+from crawlers.metrics import SpiderMetrics
+from crawlers.proxy_pool import ProxyPool
+from crawlers.sink import CrawlSink
+from crawlers.scheduler import DeadlineExceeded, RequestCancelled, RequestScheduler, PRIORITY_LIST, \
+    scheduler as default_scheduler
+from service.cookie_bridge import cookie_bridge
+from utils.serialize import append_jsonl
+
+
+# 使用代理时视为代理（出口）故障或被限流的状态码
+PROXY_FAILURE_STATUS = {407, 429, 502, 503, 504}
+
+
+class SessionExpiredError(Exception):
+    """登录状态失效（请求被重定向到登录页），需要重新登录"""
+
+    def __init__(self, url: str, login_url: str = None):
+        super().__init__(f"登录已失效: {url}")
+        self.url = url
+        self.login_url = login_url
+
+
+class _PrefixedRaw:
+    """流式响应的原始流包装：先返回已预读的开头字节，再继续读取剩余内容"""
+
+    def __init__(self, head: bytes, raw):
+        self._head = head
+        self._raw = raw
+
+    def read(self, amt: int = None, **kwargs) -> bytes:
+        if not self._head:
+            return self._raw.read(amt, decode_content=True)
+        if amt is None:
+            data, self._head = self._head + self._raw.read(decode_content=True), b''
+            return data
+        data, self._head = self._head[:amt], self._head[amt:]
+        return data
+
+    def stream(self, amt: int = 2 ** 16, **kwargs) -> Iterator[bytes]:
+        if self._head:
+            head, self._head = self._head, b''
+            yield head
+        yield from self._raw.stream(amt, decode_content=True)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
 
 
 class SimpleSpider(ABC):
@@ -14,11 +68,37 @@ class SimpleSpider(ABC):
     技术细节完全封装，开发者只需关注解析逻辑
     """
 
+    # 解析器版本，parse 的逻辑变化时修改，使解析缓存失效
+    parser_version = "1"
+
+    # 请求调度优先级（crawlers.scheduler.PRIORITY_*），数值越小越优先
+    priority = PRIORITY_LIST
+
+    # 登录页所在的域名，请求被重定向到这些域名时视为登录失效
+    login_hosts = ()
+
+    # 登录页内容特征，只在响应开头 login_marker_bytes 字节内查找
+    login_markers = ()
+    login_marker_bytes = 2048
+
     def __init__(self,
                  name: str = None,
                  delay: float = 0,
                  timeout: float = 30.0,
-                 retry_times: int = 3):
+                 retry_times: int = 3,
+                 max_workers: int = 4,
+                 metrics_path: str = None,
+                 parse_cache=None,
+                 page_archive=None,
+                 fields: Iterable[str] = None,
+                 concurrency: AdaptiveConcurrency = None,
+                 breaker: CircuitBreaker = None,
+                 proxy_pool: ProxyPool = None,
+                 proxy_key: str = None,
+                 single_flight: SingleFlight = default_single_flight,
+                 scheduler: RequestScheduler = default_scheduler,
+                 transport: HTTPAdapter = None,
+                 cancel_event: threading.Event = None):
         """
         初始化爬虫
 
@@ -27,11 +107,51 @@ class SimpleSpider(ABC):
             delay: 请求延迟，避免过于频繁
             timeout: 请求超时时间
             retry_times: 失败重试次数
+            max_workers: 并发请求时的最大线程数
+            metrics_path: 爬取结束后导出指标的文件路径（.json 或 .prom），默认不导出
+            parse_cache: ParseCache 实例，内容未变的页面直接复用上次的解析结果
+            page_archive: PageArchive 实例，成功的响应会压缩归档，便于离线重新解析
+            fields: 需要解析的字段，None 表示全部；parse 可据此跳过不需要的字段
+            concurrency: AdaptiveConcurrency 实例，按主机自适应限制同时进行的请求数，
+                默认创建一个窗口上限为 max_workers 的控制器；多个爬虫可共享同一实例
+            breaker: CircuitBreaker 实例，主机持续失败时熔断，熔断期间请求立即失败；多个爬虫可共享同一实例
+            proxy_pool: ProxyPool 实例，每次请求从代理池选择健康的代理
+            proxy_key: 代理粘性分配的键（如账号），同一账号始终使用同一出口，保持 cookie 一致
+            single_flight: SingleFlight 实例，同一会话并发的相同请求只发出一次；默认进程内共享，传入 None 关闭
+            scheduler: RequestScheduler 实例，按优先级分配全局并发名额；默认进程内共享，传入 None 不限制
+            transport: 共享的 HTTPAdapter，多个爬虫复用同一连接池（会话的请求头和 cookie 仍各自独立）
+            cancel_event: 置位后不再发出新的请求，翻页在当前页结束后停止，已爬取的数据照常返回或写入 sink
         """
         self.name = name or self.__class__.__name__
         self.delay = delay
         self.timeout = timeout
         self.retry_times = retry_times
+        self.max_workers = max_workers
+        self.metrics_path = metrics_path
+        self.parse_cache = parse_cache
+        self.page_archive = page_archive
+        self.fields = tuple(sorted(set(fields))) if fields is not None else None
+        self.logger = logging.getLogger(f"{self.__class__.__module__}.{self.name}")
+
+        # 并发请求时保护统计信息
+        self._stats_lock = threading.Lock()
+
+        # 按延迟和错误率自适应调整每个主机的并发窗口
+        self.concurrency = concurrency or AdaptiveConcurrency(max_window=max_workers)
+
+        # 主机故障时熔断，状态变化记录到统计信息
+        self.breaker = breaker or CircuitBreaker()
+        self.breaker.add_listener(self._on_circuit_change)
+
+        self.proxy_pool = proxy_pool
+        self.proxy_key = proxy_key
+        self.single_flight = single_flight
+        self.scheduler = scheduler
+        self.transport = transport
+        self.cancel_event = cancel_event
+
+        # 详细运行指标（延迟直方图、流量、阶段耗时等）
+        self.metrics = SpiderMetrics(self.name)
 
         # 创建会话
         self.session = requests.Session()
@@ -44,9 +164,17 @@ class SimpleSpider(ABC):
             'failed_requests': 0,
             'total_data': 0,
             'start_time': None,
-            'end_time': None
+            'end_time': None,
+            'concurrency': {},  # 主机 -> 当前并发窗口
+            'circuit': {},  # 主机 -> 熔断状态
+            'circuit_rejected': 0,
+            'coalesced_requests': 0,  # 与并发的相同请求合并的次数
+            'duplicate_requests': 0,  # 同一次爬取中跳过的重复请求数
+            'deadline_exceeded': 0,  # 排队超过截止时间而放弃的请求数
         }
-        self.set_cookies(cookie)
+
+        # 登录 cookie 由 cookie_bridge 实时推送，无需读取磁盘
+        cookie_bridge.register(self.session)
 
     def _setup_session(self):
         """设置默认会话配置"""
@@ -60,6 +188,21 @@ class SimpleSpider(ABC):
         }
         self.session.headers.update(default_headers)
 
+        # 连接池大小与并发数匹配，避免并发时反复建立连接
+        adapter = self.transport or HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _incr_stat(self, key: str, value: int = 1) -> int:
+        """线程安全地累加统计项，返回累加后的值"""
+        with self._stats_lock:
+            self.stats[key] += value
+            return self.stats[key]
+
+    def cancelled(self) -> bool:
+        """是否已请求停止爬取"""
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
     def set_headers(self, headers: Dict[str, str]):
         """设置请求头"""
         self.session.headers.update(headers)
@@ -69,9 +212,14 @@ class SimpleSpider(ABC):
         self.session.cookies.update(cookies)
 
     def set_proxies(self, proxies: Dict[str, str]):
-        """设置代理"""
+        """设置固定代理；设置了 proxy_pool 时每次请求使用代理池选择的代理"""
         self.session.proxies.update(proxies)
 
+    def set_proxy_pool(self, proxy_pool: ProxyPool, key: str = None):
+        """设置代理池，key 为粘性分配的键（如账号）"""
+        self.proxy_pool = proxy_pool
+        self.proxy_key = key
+
     def request(self,
                 url: str,
                 method: str = 'GET',
@@ -79,6 +227,8 @@ class SimpleSpider(ABC):
                 data: Dict = None,
                 json_data: Dict = None,
                 headers: Dict = None,
+                priority: int = None,
+                deadline: float = None,
                 **kwargs) -> Optional[requests.Response]:
         """
         执行HTTP请求
@@ -90,11 +240,44 @@ class SimpleSpider(ABC):
             data: 表单数据
             json_data: JSON数据
             headers: 请求头
+            priority: 调度优先级，默认使用爬虫的 priority
+            deadline: 最多排队等待的秒数，超时仍未排到则放弃请求
             **kwargs: 其他requests参数
 
         Returns:
             Response对象或None
         """
+        if priority is None:
+            priority = self.priority
+        if deadline is not None:
+            deadline = time.monotonic() + deadline
+        kwargs.update(priority=priority, deadline=deadline)
+
+        # 流式响应的内容只能读取一次，不参与合并
+        if kwargs.get('stream') or self.single_flight is None:
+            return self._request(url, method, params, data, json_data, headers, **kwargs)
+
+        # 并发的相同请求只发出一次，其余调用者共享结果；不同会话（账号、代理）的请求不合并
+        key = (request_fingerprint(method, url, params, data, json_data) + ':'
+               + session_identity(self.session, headers, self.proxy_key))
+        response, shared = self.single_flight.do(
+            key, lambda: self._request(url, method, params, data, json_data, headers, **kwargs))
+        if shared:
+            self._incr_stat('coalesced_requests')
+            self.logger.debug("合并相同请求: %s %s", method, url)
+        return response
+
+    def _request(self,
+                 url: str,
+                 method: str = 'GET',
+                 params: Dict = None,
+                 data: Dict = None,
+                 json_data: Dict = None,
+                 headers: Dict = None,
+                 priority: int = PRIORITY_LIST,
+                 deadline: float = None,
+                 **kwargs) -> Optional[requests.Response]:
+        """实际执行请求（含重试），参数同 request，deadline 为 time.monotonic() 时间点"""
         # 请求配置
         request_kwargs = {
             'timeout': self.timeout,
@@ -111,41 +294,218 @@ class SimpleSpider(ABC):
 
         request_kwargs.update(kwargs)
 
+        # 响应钩子在下载响应体之前执行，重定向到登录页时立即中止
+        if self.login_hosts and 'hooks' not in request_kwargs:
+            request_kwargs['hooks'] = {'response': self._check_login_redirect}
+
+        host = urlparse(url).hostname or ''
+
         # 重试机制
         for attempt in range(self.retry_times):
+            if self.cancelled():
+                self.logger.info("爬取已取消，放弃请求: %s", url)
+                break
+            # 主机熔断中直接失败，不再等待超时
+            if not self.breaker.allow(host):
+                self._incr_stat('circuit_rejected')
+                self.logger.warning("主机 %s 熔断中，跳过请求: %s", host, url)
+                break
+            if attempt > 0:
+                self.metrics.observe_retry()
+            start = time.perf_counter()
+            # 放行后无论在哪一步失败都要调用 breaker.record，否则半开状态的探测名额不会归还
+            outcome = None
             try:
-                self.stats['total_requests'] += 1
+                total_requests = self._incr_stat('total_requests')
 
                 # 请求延迟
-                if self.delay > 0 and self.stats['total_requests'] > 1:
+                if self.delay > 0 and total_requests > 1:
                     time.sleep(self.delay)
 
-                print(f"[{self.name}] {method} {url}")
+                self.logger.debug("%s %s", method, url)
 
-                # 执行请求
-                response = self.session.request(
-                    method=method.upper(),
-                    url=url,
-                    **request_kwargs
-                )
+                # 使用代理池时每次尝试选择一个代理；并发窗口按出口区分，限流针对的是出口 IP
+                proxy = self.proxy_pool.acquire(self.proxy_key) if self.proxy_pool is not None else None
+                window_key = f"{host}@{self.proxy_pool.label(proxy)}" if proxy else host
+                attempt_kwargs = request_kwargs
+                if proxy:
+                    attempt_kwargs = dict(request_kwargs, proxies=self.proxy_pool.proxies_for(proxy))
+
+                # 执行请求，结果反馈给自适应窗口、熔断器和代理池
+                proxy_ok = sent = None
+                try:
+                    # 先等主机的并发窗口，再按优先级排队获取全局名额：
+                    # 等待慢主机的请求不占用全局名额，其他主机的请求不受影响
+                    # 等待主机窗口时同样受截止时间和取消的约束，不会无限阻塞
+                    with self.concurrency.slot(window_key, deadline, self.cancel_event) as slot, \
+                            self._schedule(priority, deadline):
+                        slot.mark_sent()
+                        sent = time.perf_counter()
+                        response = self.session.request(
+                            method=method.upper(),
+                            url=url,
+                            **attempt_kwargs
+                        )
+
+                        # 流式响应不读取内容，只按响应头统计流量
+                        if request_kwargs.get('stream'):
+                            nbytes = int(response.headers.get('Content-Length') or 0)
+                        else:
+                            nbytes = len(response.content)
+                        slot.status_code = response.status_code
+                    outcome = response.status_code < 500
+                    proxy_ok = response.status_code not in PROXY_FAILURE_STATUS
+                except requests.exceptions.ProxyError:
+                    # 代理本身不可用，不计入目标主机的熔断统计
+                    proxy_ok = False
+                    raise
+                except requests.RequestException:
+                    outcome = proxy_ok = False
+                    raise
+                finally:
+                    if proxy:
+                        self.proxy_pool.release(proxy, time.perf_counter() - sent if sent else None, proxy_ok)
+                    self._update_window_stat(window_key)
+                self.metrics.observe_request(time.perf_counter() - start, response.status_code, nbytes)
 
                 # 检查状态码
                 if response.status_code == 200:
-                    self.stats['success_requests'] += 1
+                    self._check_login_page(response, stream=bool(request_kwargs.get('stream')))
+                    self._incr_stat('success_requests')
+                    if self.page_archive is not None and not request_kwargs.get('stream'):
+                        self._archive(response, params)
                     return response
                 else:
-                    print(f"[{self.name}] 请求失败: {response.status_code}")
+                    self.logger.warning("请求失败: %s %s", response.status_code, url)
+
+            except SessionExpiredError as e:
+                self._incr_stat('failed_requests')
+                self.logger.warning("%s", e)
+                raise
+
+            except DeadlineExceeded as e:
+                self._incr_stat('deadline_exceeded')
+                self.logger.warning("%s: %s", e, url)
+                break
+
+            except RequestCancelled as e:
+                self.logger.info("%s，放弃请求: %s", e, url)
+                break
 
             except requests.RequestException as e:
-                print(f"[{self.name}] 请求异常 (尝试 {attempt + 1}/{self.retry_times}): {e}")
+                self.metrics.observe_request(time.perf_counter() - start)
+                self.logger.warning("请求异常 (尝试 %d/%d): %s", attempt + 1, self.retry_times, e)
 
             except Exception as e:
-                print(f"[{self.name}] 未知错误: {e}")
+                self.logger.exception("未知错误: %s", e)
                 break
 
-        self.stats['failed_requests'] += 1
+            finally:
+                # 排队超时、取代理失败等未发出请求的情况 outcome 为 None，只归还熔断器的放行
+                self.breaker.record(host, outcome)
+
+        self._incr_stat('failed_requests')
         return None
 
+    def _schedule(self, priority: int, deadline: float = None):
+        """调度器名额的上下文，未设置调度器时不限制"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(priority, deadline)
+
+    def _update_window_stat(self, host: str):
+        window = self.concurrency.window(host)
+        with self._stats_lock:
+            self.stats['concurrency'][host] = round(window, 2)
+        self.metrics.set_concurrency(host, window)
+
+    def _on_circuit_change(self, host: str, old: str, new: str):
+        with self._stats_lock:
+            self.stats['circuit'][host] = new
+        self.logger.warning("主机 %s 熔断状态变化: %s -> %s", host, old, new)
+
+    def _is_login_url(self, url: str) -> bool:
+        host = urlparse(url).hostname or ''
+        return any(host == h or host.endswith('.' + h) for h in self.login_hosts)
+
+    def _check_login_redirect(self, response: requests.Response, *args, **kwargs):
+        """响应钩子：重定向目标或最终地址是登录页时中止请求"""
+        target = response.headers.get('Location', '') if response.is_redirect else response.url
+        if target and self._is_login_url(urljoin(response.url, target)):
+            response.close()
+            raise SessionExpiredError(response.request.url if response.request else response.url, target)
+        return response
+
+    def _check_login_page(self, response: requests.Response, stream: bool = False):
+        """
+        检查响应开头是否为登录页（JS 跳转等不走 HTTP 重定向的情况）
+
+        Args:
+            response: 响应对象
+            stream: 是否为流式响应。流式响应只预读开头 login_marker_bytes 字节，
+                是登录页时立即关闭连接，不下载剩余内容；否则预读的字节会在后续读取时原样返回
+        """
+        if not self.login_markers:
+            return
+        if stream:
+            head = response.raw.read(self.login_marker_bytes, decode_content=True)
+            response.raw = _PrefixedRaw(head, response.raw)
+        else:
+            head = response.content[:self.login_marker_bytes]
+        if any(marker in head for marker in self.login_markers):
+            response.close()
+            raise SessionExpiredError(response.url)
+
+    def request_many(self,
+                     urls: List[str],
+                     max_workers: int = None,
+                     **request_kwargs) -> Iterator[Tuple[str, Optional[requests.Response]]]:
+        """
+        并发执行多个请求，按完成顺序返回结果
+
+        Args:
+            urls: 要请求的URL列表
+            max_workers: 最大并发数，默认使用 self.max_workers
+            **request_kwargs: 传给 request 的参数
+
+        Yields:
+            (url, Response对象或None)
+        """
+        if not urls:
+            return
+
+        # 同一批里等价的请求只发一次
+        seen = SeenSet()
+        unique_urls = [url for url in urls if seen.add(self.fingerprint(url, **request_kwargs))]
+        if len(unique_urls) < len(urls):
+            self._incr_stat('duplicate_requests', len(urls) - len(unique_urls))
+            self.logger.debug("跳过 %d 个重复请求", len(urls) - len(unique_urls))
+        urls = unique_urls
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            futures = {executor.submit(self.request, url, **request_kwargs): url for url in urls}
+            pending = len(futures)
+            self.metrics.set_queue_depth(pending)
+            for future in as_completed(futures):
+                pending -= 1
+                self.metrics.set_queue_depth(pending)
+                yield futures[future], future.result()
+
+    def fingerprint(self, url: str, method: str = 'GET', params: Dict = None, data: Dict = None,
+                    json_data: Dict = None, **kwargs) -> str:
+        """请求指纹，参数同 request"""
+        return request_fingerprint(method, url, params, data, json_data)
+
+    def _archive(self, response: requests.Response, params: Dict = None):
+        """归档响应内容，归档失败不影响爬取"""
+        try:
+            page = (params or {}).get('page')
+            self.page_archive.append(response.url, response.content, spider=self.name,
+                                     page=int(page) if page is not None else None,
+                                     encoding=response.encoding)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.logger.error("页面归档失败 %s: %s", response.url, e)
+
     def get(self, url: str, **kwargs) -> Optional[requests.Response]:
         """GET请求快捷方法"""
         return self.request(url, 'GET', **kwargs)
@@ -171,10 +531,10 @@ class SimpleSpider(ABC):
             try:
                 with open(filepath, 'wb') as f:
                     f.write(response.content)
-                print(f"[{self.name}] 文件下载成功: {filepath}")
+                self.logger.info("文件下载成功: %s", filepath)
                 return True
             except Exception as e:
-                print(f"[{self.name}] 文件保存失败: {e}")
+                self.logger.error("文件保存失败: %s", e)
         return False
 
     def build_url(self, base_url: str, **path_params) -> str:
@@ -205,6 +565,15 @@ class SimpleSpider(ABC):
         """
         pass
 
+    def parse_response(self, response: requests.Response) -> List[Dict[str, Any]]:
+        """解析响应，设置了解析缓存时优先使用缓存"""
+        if self.parse_cache is None:
+            return self.parse(response)
+        # 不同字段投影的解析结果分开缓存
+        namespace = self.name if self.fields is None else f"{self.name}[{','.join(self.fields)}]"
+        return self.parse_cache.get_or_parse(response.content, namespace, self.parser_version,
+                                             lambda: self.parse(response))
+
     def process_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
         处理单条数据 - 可选重写
@@ -217,6 +586,19 @@ class SimpleSpider(ABC):
         """
         return item
 
+    def normalize_item(self, item: Dict[str, Any]) -> Any:
+        """
+        规范化单条数据 - 可选重写，在 process_item 之后调用
+        可将字典转换为带类型的紧凑记录（如 crawlers.order.Order）
+
+        Args:
+            item: 处理后的数据项
+
+        Returns:
+            规范化后的数据项
+        """
+        return item
+
     def save_data(self, data: List[Dict[str, Any]]):
         """
         保存数据 - 可选重写
@@ -227,44 +609,64 @@ class SimpleSpider(ABC):
         if not data:
             return
 
-        # 默认保存为JSON文件
-        filename = f"{self.name}_{int(time.time())}.json"
+        # 默认保存为 JSON Lines 文件，每条数据一行，可追加、可逐行读取
+        filename = f"{self.name}_{int(time.time())}.jsonl"
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"[{self.name}] 数据已保存到: {filename}")
+            append_jsonl(filename, data)
+            self.logger.info("数据已保存到: %s", filename)
         except Exception as e:
-            print(f"[{self.name}] 数据保存失败: {e}")
+            self.logger.error("数据保存失败: %s", e)
 
     def before_start(self):
         """爬取开始前的准备工作 - 可选重写"""
-        print(f"[{self.name}] 开始爬取...")
+        self.logger.info("开始爬取...")
         self.stats['start_time'] = time.time()
 
-    def after_finish(self, data: List[Dict[str, Any]]):
-        """爬取结束后的清理工作 - 可选重写"""
+    def after_finish(self, data: List[Dict[str, Any]], count: int = None):
+        """
+        爬取结束后的清理工作 - 可选重写
+
+        Args:
+            data: 数据列表
+            count: 数据条数，数据已写入 sink 而没有保留列表时使用
+        """
         self.stats['end_time'] = time.time()
-        self.stats['total_data'] = len(data)
+        self.stats['total_data'] = count if count is not None else len(data)
 
         duration = self.stats['end_time'] - self.stats['start_time']
-        print(f"[{self.name}] 爬取完成!")
-        print(f"[{self.name}] 统计信息:")
-        print(f"  - 总请求数: {self.stats['total_requests']}")
-        print(f"  - 成功请求: {self.stats['success_requests']}")
-        print(f"  - 失败请求: {self.stats['failed_requests']}")
-        print(f"  - 获取数据: {self.stats['total_data']} 条")
-        print(f"  - 耗时: {duration:.2f} 秒")
-
-    def crawl(self, urls: Union[str, List[str]], **request_kwargs) -> List[Dict[str, Any]]:
+        self.logger.info("爬取完成! 总请求数: %d，成功请求: %d，失败请求: %d，获取数据: %d 条，耗时: %.2f 秒",
+                         self.stats['total_requests'], self.stats['success_requests'],
+                         self.stats['failed_requests'], self.stats['total_data'], duration)
+        self.logger.info("指标: %s", self.metrics.summary())
+        if self.stats['concurrency']:
+            self.logger.info("并发窗口: %s", self.stats['concurrency'])
+        if self.stats['circuit_rejected']:
+            self.logger.warning("熔断拒绝 %d 次请求，熔断状态: %s",
+                                self.stats['circuit_rejected'], self.stats['circuit'])
+        if self.proxy_pool is not None:
+            self.logger.info("代理状态: %s", self.proxy_pool.snapshot())
+        if self.stats['coalesced_requests'] or self.stats['duplicate_requests']:
+            self.logger.info("合并相同请求 %d 次，跳过重复请求 %d 次",
+                             self.stats['coalesced_requests'], self.stats['duplicate_requests'])
+
+        if self.metrics_path:
+            try:
+                self.metrics.export(self.metrics_path)
+            except OSError as e:
+                self.logger.error("指标导出失败: %s", e)
+
+    def crawl(self, urls: Union[str, List[str]], sink: CrawlSink = None,
+              **request_kwargs) -> Union[List[Dict[str, Any]], Dict[str, int]]:
         """
         执行爬取任务
 
         Args:
             urls: 要爬取的URL或URL列表
+            sink: CrawlSink 实例，数据边爬取边分批写入，不在内存中累积
             **request_kwargs: 请求参数
 
         Returns:
-            爬取到的所有数据
+            爬取到的所有数据；指定 sink 时返回 sink.summary()
         """
         # 准备阶段
         self.before_start()
@@ -274,29 +676,50 @@ class SimpleSpider(ABC):
             urls = [urls]
 
         all_data = []
+        seen = SeenSet()
 
         # 遍历URL进行爬取
         for url in urls:
+            if self.cancelled():
+                self.logger.info("爬取已取消")
+                break
+            if not seen.add(self.fingerprint(url, **request_kwargs)):
+                self._incr_stat('duplicate_requests')
+                self.logger.debug("跳过重复URL: %s", url)
+                continue
+
             response = self.request(url, **request_kwargs)
 
             if response:
                 try:
-                    # 解析数据
-                    items = self.parse(response)
-
-                    # 处理数据
-                    processed_items = []
-                    for item in items:
-                        processed_item = self.process_item(item)
-                        processed_items.append(processed_item)
-
-                    all_data.extend(processed_items)
-                    print(f"[{self.name}] 从 {url} 解析出 {len(processed_items)} 条数据")
+                    with self.metrics.stage('parse'):
+                        # 解析数据
+                        items = self.parse_response(response)
+
+                        # 处理数据
+                        processed_items = []
+                        for item in items:
+                            processed_item = self.normalize_item(self.process_item(item))
+                            processed_items.append(processed_item)
+
+                    self.metrics.observe_items(len(processed_items))
+                    if sink is not None:
+                        sink.add_many(processed_items)
+                    else:
+                        all_data.extend(processed_items)
+                    self.logger.info("从 %s 解析出 %d 条数据", url, len(processed_items))
 
                 except Exception as e:
-                    print(f"[{self.name}] 解析失败 {url}: {e}")
+                    self.logger.error("解析失败 %s: %s", url, e)
             else:
-                print(f"[{self.name}] 请求失败: {url}")
+                self.logger.warning("请求失败: %s", url)
+
+        # 数据已分批写入 sink，只返回摘要
+        if sink is not None:
+            sink.flush()
+            summary = sink.summary()
+            self.after_finish(all_data, count=summary['items'])
+            return summary
 
         # 保存数据
         self.save_data(all_data)
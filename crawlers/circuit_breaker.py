@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class HostCircuit:
+    """单个主机的熔断状态"""
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)  # 最近请求是否成功
+        self.opened_at = 0.0
+        self.probes = 0  # 半开状态下正在进行的探测请求数
+        self.rejected = 0
+
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'failure_rate': round(self.failure_rate(), 3),
+            'requests': len(self.outcomes),
+            'rejected': self.rejected,
+        }
+
+
+class CircuitBreaker:
+    """
+    按主机熔断
+    closed：正常放行，统计最近 window 个请求的失败率，超过阈值时熔断
+    open：直接拒绝请求，冷却 cooldown 秒后进入半开
+    half_open：只放行少量探测请求，成功则恢复，失败则重新熔断
+    """
+
+    def __init__(self,
+                 failure_threshold: float = 0.5,
+                 window: int = 20,
+                 min_requests: int = 5,
+                 cooldown: float = 30.0,
+                 half_open_probes: int = 1):
+        """
+        Args:
+            failure_threshold: 触发熔断的失败率
+            window: 统计失败率的最近请求数
+            min_requests: 请求数达到该值后才判断失败率
+            cooldown: 熔断后等待多少秒再探测
+            half_open_probes: 半开状态下同时放行的探测请求数
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self._hosts: Dict[str, HostCircuit] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[], Optional[Callable[[str, str, str], None]]]] = []
+
+    def add_listener(self, listener: Callable[[str, str, str], None]):
+        """注册状态变化回调 listener(host, old_state, new_state)；绑定方法以弱引用保存，不影响爬虫回收"""
+        if hasattr(listener, '__self__'):
+            ref = weakref.WeakMethod(listener)
+        else:
+            ref = lambda: listener
+        self._listeners.append(ref)
+
+    def _host(self, host: str) -> HostCircuit:
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = self._hosts[host] = HostCircuit(self.window)
+        return circuit
+
+    def _transition(self, host: str, circuit: HostCircuit, state: str, events: list):
+        events.append((host, circuit.state, state))
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+        elif state == CLOSED:
+            circuit.outcomes.clear()
+        circuit.probes = 0
+
+    def _notify(self, events: list):
+        # 回调在锁外执行，回调中可以安全地查询熔断状态；状态变化的日志由监听方（爬虫）输出
+        for host, old, new in events:
+            for ref in list(self._listeners):
+                listener = ref()
+                if listener is None:
+                    with self._lock:
+                        if ref in self._listeners:
+                            self._listeners.remove(ref)
+                    continue
+                try:
+                    listener(host, old, new)
+                except Exception as e:
+                    logger.error("熔断状态回调出错: %s", e)
+
+    def allow(self, host: str) -> bool:
+        """
+        是否放行请求；放行后必须调用 record 报告结果
+
+        Returns:
+            False 表示熔断中，应立即失败
+        """
+        events = []
+        with self._lock:
+            circuit = self._host(host)
+            if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.cooldown:
+                self._transition(host, circuit, HALF_OPEN, events)
+            if circuit.state == CLOSED:
+                allowed = True
+            elif circuit.state == HALF_OPEN and circuit.probes < self.half_open_probes:
+                circuit.probes += 1
+                allowed = True
+            else:
+                circuit.rejected += 1
+                allowed = False
+        self._notify(events)
+        return allowed
+
+    def record(self, host: str, success: Optional[bool]):
+        """
+        报告已放行请求的结果
+
+        Args:
+            success: True 成功，False 失败（网络异常、5xx），None 不计入（如登录失效中止）
+        """
+        events = []
+        with self._lock:
+            circuit = self._host(host)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(circuit.probes - 1, 0)
+                if success is True:
+                    self._transition(host, circuit, CLOSED, events)
+                elif success is False:
+                    self._transition(host, circuit, OPEN, events)
+            elif circuit.state == CLOSED and success is not None:
+                circuit.outcomes.append(success)
+                if (len(circuit.outcomes) >= self.min_requests
+                        and circuit.failure_rate() >= self.failure_threshold):
+                    self._transition(host, circuit, OPEN, events)
+        self._notify(events)
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._host(host).state
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{主机: 熔断状态}"""
+        with self._lock:
+            return {host: circuit.to_dict() for host, circuit in self._hosts.items()}
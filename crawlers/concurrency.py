@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from typing import Dict, Any
+
+import requests
+
+from crawlers.scheduler import DeadlineExceeded, RequestCancelled
+
+logger = logging.getLogger(__name__)
+
+# 视为被限流或服务过载的状态码
+THROTTLE_STATUS = {429, 503}
+
+# 等待并发名额时每次最多阻塞的秒数，到期后检查取消和截止时间
+WAIT_SLICE = 0.5
+
+
+class HostWindow:
+    """单个主机的并发窗口状态"""
+
+    def __init__(self, window: float, max_window: float):
+        self.window = window
+        self.max_window = max_window
+        self.in_flight = 0
+        self.latency = None       # 延迟的指数移动平均
+        self.base_latency = None  # 无拥塞时的延迟基线
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.congestions = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'window': round(self.window, 2),
+            'in_flight': self.in_flight,
+            'latency': round(self.latency, 4) if self.latency is not None else None,
+            'base_latency': round(self.base_latency, 4) if self.base_latency is not None else None,
+            'successes': self.successes,
+            'congestions': self.congestions,
+        }
+
+
+class AdaptiveConcurrency:
+    """
+    按主机自适应的并发控制（AIMD）
+    每个主机维护一个并发窗口：请求正常时窗口加性增长（约每轮 +1），
+    出现 429/5xx、超时或延迟明显高于基线时窗口减半，同一轮内只减一次
+    """
+
+    def __init__(self,
+                 max_window: int = 4,
+                 initial_window: float = 2,
+                 min_window: float = 1,
+                 decrease_factor: float = 0.5,
+                 latency_factor: float = 3.0,
+                 alpha: float = 0.2,
+                 host_limits: Dict[str, int] = None):
+        """
+        Args:
+            max_window: 单个主机的最大并发数
+            initial_window: 初始并发窗口
+            min_window: 最小并发窗口
+            decrease_factor: 拥塞时窗口的缩减比例
+            latency_factor: 延迟超过基线的倍数时视为拥塞
+            alpha: 延迟移动平均的平滑系数
+            host_limits: {主机: 最大并发数}，覆盖个别站点的 max_window
+        """
+        self.max_window = max(max_window, 1)
+        self.min_window = max(min(min_window, self.max_window), 1)
+        self.initial_window = min(max(initial_window, self.min_window), self.max_window)
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.alpha = alpha
+        self.host_limits = dict(host_limits or {})
+        self._hosts: Dict[str, HostWindow] = {}
+        self._cond = threading.Condition()
+
+    def _max_window(self, host: str) -> float:
+        # 使用代理时键为 主机@代理，按主机查找上限
+        return max(self.host_limits.get(host.split('@', 1)[0], self.max_window), 1)
+
+    def _host(self, host: str) -> HostWindow:
+        state = self._hosts.get(host)
+        if state is None:
+            max_window = self._max_window(host)
+            state = self._hosts[host] = HostWindow(min(self.initial_window, max_window), max_window)
+        return state
+
+    def acquire(self, host: str, deadline: float = None, cancel_event: threading.Event = None):
+        """
+        等待主机有空闲的并发名额
+
+        Args:
+            host: 主机名
+            deadline: 截止时间（time.monotonic()），到期仍未等到时抛出 DeadlineExceeded
+            cancel_event: 置位后停止等待并抛出 RequestCancelled
+        """
+        with self._cond:
+            state = self._host(host)
+            while state.in_flight >= int(state.window):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled(f"等待主机 {host} 的并发名额时已取消")
+                timeout = WAIT_SLICE
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DeadlineExceeded(f"等待主机 {host} 的并发名额超时")
+                    timeout = min(timeout, remaining)
+                self._cond.wait(timeout)
+            state.in_flight += 1
+
+    def release(self, host: str, latency: float = None, status_code: int = None, error: bool = False):
+        """
+        归还并发名额并根据结果调整窗口
+
+        Args:
+            host: 主机名
+            latency: 请求耗时（秒），None 表示不参与调整（如登录失效中止的请求）
+            status_code: 响应状态码
+            error: 是否为超时、连接失败等网络异常
+        """
+        with self._cond:
+            state = self._host(host)
+            state.in_flight -= 1
+            if latency is not None:
+                self._adjust(state, latency, status_code, error)
+            self._cond.notify_all()
+
+    def _adjust(self, state: HostWindow, latency: float, status_code: int, error: bool):
+        if not error:
+            state.latency = latency if state.latency is None else \
+                state.latency + self.alpha * (latency - state.latency)
+            if state.base_latency is None or latency < state.base_latency:
+                state.base_latency = latency
+            else:
+                # 基线缓慢上移，跟随不同时段服务端的正常延迟变化
+                state.base_latency += (latency - state.base_latency) * 0.01
+
+        slow = (state.latency is not None and state.latency > state.base_latency * self.latency_factor)
+        congested = error or slow or (status_code is not None and
+                                      (status_code in THROTTLE_STATUS or status_code >= 500))
+        if congested:
+            state.congestions += 1
+            now = time.monotonic()
+            # 一轮（约一个平均延迟）内只减一次，避免同一批失败把窗口连续减到底
+            if now - state.last_decrease >= (state.latency or 0):
+                state.window = max(self.min_window, state.window * self.decrease_factor)
+                state.last_decrease = now
+        else:
+            state.successes += 1
+            state.window = min(state.max_window, state.window + 1 / state.window)
+
+    def slot(self, host: str, deadline: float = None, cancel_event: threading.Event = None) -> 'ConcurrencySlot':
+        """with concurrency.slot(host) as slot: ...; slot.status_code = response.status_code"""
+        return ConcurrencySlot(self, host, deadline, cancel_event)
+
+    def window(self, host: str) -> float:
+        with self._cond:
+            return self._host(host).window
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{主机: 窗口状态}"""
+        with self._cond:
+            return {host: state.to_dict() for host, state in self._hosts.items()}
+
+
+class ConcurrencySlot:
+    """占用一个并发名额的上下文，退出时按响应状态码或异常类型反馈给控制器"""
+
+    def __init__(self, controller: AdaptiveConcurrency, host: str,
+                 deadline: float = None, cancel_event: threading.Event = None):
+        self.controller = controller
+        self.host = host
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.status_code = None
+        self._start = None
+
+    def __enter__(self):
+        self.controller.acquire(self.host, self.deadline, self.cancel_event)
+        self._start = time.perf_counter()
+        return self
+
+    def mark_sent(self):
+        """记录请求实际发出的时间，占用名额后的排队时间（如等待调度器）不计入延迟"""
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        latency = time.perf_counter() - self._start
+        if exc_type is None:
+            self.controller.release(self.host, latency, self.status_code)
+        elif issubclass(exc_type, requests.RequestException):
+            self.controller.release(self.host, latency, error=True)
+        else:
+            self.controller.release(self.host)
+        return False
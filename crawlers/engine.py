@@ -0,0 +1,166 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Type, Union
+
+from requests.adapters import HTTPAdapter
+
+from crawlers.base_spider import SimpleSpider
+from crawlers.circuit_breaker import CircuitBreaker
+from crawlers.concurrency import AdaptiveConcurrency
+from crawlers.fingerprint import SingleFlight
+from crawlers.scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+# 各爬虫 stats 中可以直接累加的计数项
+COUNTER_STATS = ('total_requests', 'success_requests', 'failed_requests', 'circuit_rejected',
+                 'coalesced_requests', 'duplicate_requests', 'deadline_exceeded')
+
+
+class CrawlJob:
+    """引擎中注册的一个爬虫及其要执行的任务"""
+
+    def __init__(self, spider: SimpleSpider, run: Callable[[SimpleSpider], List[Any]]):
+        self.spider = spider
+        self.run = run
+        self.data: List[Any] = []
+        self.summary: Dict[str, int] = None  # 使用 sink 的任务返回的 sink.summary()
+        self.error: Exception = None
+        self.duration = 0.0
+
+    def set_result(self, result: Union[List[Any], Dict[str, int], None]):
+        """记录任务结果：数据列表，或数据已写入 sink 时的摘要"""
+        if isinstance(result, dict):
+            self.summary = result
+            self.data = []
+        else:
+            self.data = result or []
+
+    @property
+    def item_count(self) -> int:
+        if self.summary is not None:
+            return self.summary.get('items', 0)
+        return len(self.data)
+
+
+class CrawlEngine:
+    """
+    多爬虫共享的爬取引擎
+    注册的爬虫共用一个调度器、连接池、并发控制和熔断器：全局并发由 capacity 限制，
+    每个站点的并发由 max_per_site / site_limits 限制；运行结束后汇总各爬虫的数据和统计
+    """
+
+    def __init__(self,
+                 capacity: int = 8,
+                 max_per_site: int = 4,
+                 site_limits: Dict[str, int] = None,
+                 shares: Dict[int, float] = None,
+                 **spider_kwargs):
+        """
+        Args:
+            capacity: 所有爬虫同时进行的最大请求数
+            max_per_site: 单个站点的最大并发数
+            site_limits: {主机: 最大并发数}，覆盖个别站点的 max_per_site
+            shares: 各优先级最多占用的并发比例，见 crawlers.scheduler.DEFAULT_SHARES
+            **spider_kwargs: 传给每个爬虫的公共参数（如 parse_cache、page_archive、proxy_pool）
+        """
+        self.scheduler = RequestScheduler(capacity, shares)
+        self.concurrency = AdaptiveConcurrency(max_window=max_per_site, host_limits=site_limits)
+        self.breaker = CircuitBreaker()
+        # 合并请求的键包含会话身份（cookie、认证头、代理），不同账号的爬虫共享实例也不会互相合并
+        self.single_flight = SingleFlight()
+        self.transport = HTTPAdapter(pool_connections=capacity, pool_maxsize=capacity)
+        self.spider_kwargs = spider_kwargs
+        self.jobs: Dict[str, CrawlJob] = {}
+
+    def add(self,
+            spider_cls: Type[SimpleSpider],
+            run: Callable[[SimpleSpider], List[Any]] = None,
+            urls: List[str] = None,
+            **kwargs) -> SimpleSpider:
+        """
+        注册一个爬虫
+
+        Args:
+            spider_cls: SimpleSpider 子类
+            run: 爬取任务 run(spider) -> 数据列表，如 lambda s: s.crawl_all_pages(url)；
+                数据写入 sink 时可返回 sink.summary()
+            urls: 未指定 run 时执行 spider.crawl(urls)
+            **kwargs: 爬虫的构造参数，name 相同的爬虫不能重复注册
+
+        Returns:
+            创建的爬虫实例，可在运行前继续设置请求头等
+        """
+        if run is None:
+            if urls is None:
+                raise ValueError("必须指定 run 或 urls")
+            run = lambda spider: spider.crawl(urls)
+
+        options = dict(self.spider_kwargs, **kwargs)
+        options.update(scheduler=self.scheduler, concurrency=self.concurrency, breaker=self.breaker,
+                       single_flight=self.single_flight, transport=self.transport)
+        spider = spider_cls(**options)
+        if spider.name in self.jobs:
+            raise ValueError(f"爬虫名称重复: {spider.name}")
+        self.jobs[spider.name] = CrawlJob(spider, run)
+        return spider
+
+    def run(self) -> Dict[str, List[Any]]:
+        """
+        并发执行所有注册的任务，单个任务失败不影响其他任务
+
+        Returns:
+            {爬虫名称: 数据列表}，数据写入 sink 的任务为 sink.summary()；失败的任务见 errors()
+        """
+        def execute(job: CrawlJob):
+            start = time.perf_counter()
+            try:
+                job.set_result(job.run(job.spider))
+            except Exception as e:
+                job.error = e
+                job.spider.logger.error("爬取任务失败: %s", e)
+            finally:
+                job.duration = time.perf_counter() - start
+
+        jobs = list(self.jobs.values())
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                list(executor.map(execute, jobs))
+        logger.info("引擎运行完成: %s", self.summary())
+        return {name: job.summary if job.summary is not None else job.data for name, job in self.jobs.items()}
+
+    def errors(self) -> Dict[str, Exception]:
+        return {name: job.error for name, job in self.jobs.items() if job.error is not None}
+
+    def items(self) -> List[Any]:
+        """所有爬虫的数据合并为一个列表（写入 sink 的数据不在其中）"""
+        return [item for job in self.jobs.values() for item in job.data]
+
+    def stats(self) -> Dict[str, Any]:
+        """汇总统计：计数项累加，并附带各爬虫、调度器、并发窗口和熔断器的状态"""
+        totals = {key: 0 for key in COUNTER_STATS}
+        spiders = {}
+        for name, job in self.jobs.items():
+            for key in COUNTER_STATS:
+                totals[key] += job.spider.stats.get(key, 0)
+            spiders[name] = {
+                **{key: job.spider.stats.get(key, 0) for key in COUNTER_STATS},
+                'items': job.item_count,
+                'duration': round(job.duration, 3),
+                'error': str(job.error) if job.error else None,
+            }
+        totals['items'] = sum(job.item_count for job in self.jobs.values())
+        return {
+            'totals': totals,
+            'spiders': spiders,
+            'scheduler': self.scheduler.snapshot(),
+            'concurrency': self.concurrency.snapshot(),
+            'circuit': self.breaker.snapshot(),
+        }
+
+    def summary(self) -> str:
+        totals = self.stats()['totals']
+        return (f"{len(self.jobs)} 个爬虫，请求 {totals['total_requests']} 次，"
+                f"成功 {totals['success_requests']}，失败 {totals['failed_requests']}，"
+                f"合并 {totals['coalesced_requests']}，数据 {totals['items']} 条")
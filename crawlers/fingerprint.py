@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str, params: Dict = None) -> str:
+    """
+    规范化URL：协议和域名小写、去掉默认端口和锚点、合并 params 并按参数名排序
+
+    Args:
+        url: 原始URL
+        params: 额外的查询参数，与 URL 中已有的参数合并
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host if parts.port is None or DEFAULT_PORTS.get(scheme) == parts.port else f"{host}:{parts.port}"
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for key, values in (params or {}).items():
+        if values is None:
+            continue
+        for value in values if isinstance(values, (list, tuple)) else [values]:
+            query.append((str(key), str(value)))
+    query.sort()
+    return urlunsplit((scheme, netloc, parts.path or '/', urlencode(query), ''))
+
+
+def request_fingerprint(method: str, url: str, params: Dict = None, data: Any = None, json_data: Any = None) -> str:
+    """
+    请求指纹：规范化后的方法、URL、查询参数和请求体的哈希，等价的请求指纹相同
+
+    Returns:
+        40 位十六进制字符串
+    """
+    if isinstance(data, dict):
+        body = urlencode(sorted((str(k), str(v)) for k, v in data.items()))
+    elif isinstance(data, bytes):
+        body = data.decode('utf-8', errors='replace')
+    else:
+        body = str(data) if data else ''
+    if json_data is not None:
+        body += json.dumps(json_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    text = f"{method.upper()} {canonicalize_url(url, params)}\n{body}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+# 决定请求身份的请求头，取值不同的相同请求可能得到不同的响应
+IDENTITY_HEADERS = ('cookie', 'authorization', 'proxy-authorization')
+
+
+def session_identity(session, headers: Dict = None, proxy_key: str = None) -> str:
+    """
+    会话身份：cookie、认证请求头和代理设置的哈希
+    不同账号（或出口）发出的相同请求不能共享响应，合并请求时与请求指纹一起作为键
+
+    Args:
+        session: requests.Session
+        headers: 本次请求额外的请求头
+        proxy_key: 代理粘性分配的键
+
+    Returns:
+        40 位十六进制字符串
+    """
+    cookies = sorted((c.domain, c.path, c.name, c.value or '') for c in list(session.cookies))
+    merged = dict(session.headers)
+    merged.update(headers or {})
+    auth = sorted((k.lower(), str(v)) for k, v in merged.items() if k.lower() in IDENTITY_HEADERS)
+    proxies = sorted((session.proxies or {}).items())
+    text = json.dumps([cookies, auth, proxies, proxy_key], ensure_ascii=False)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """
+    相同键的并发调用只执行一次
+    第一个调用者执行函数，执行期间到达的其他调用者等待并共享同一结果（或异常）
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns:
+            (结果, 是否共享了其他调用者的结果)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class SeenSet:
+    """一次爬取内已请求过的指纹集合（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+
+    def add(self, fingerprint: str) -> bool:
+        """加入指纹，返回 False 表示已经见过"""
+        with self._lock:
+            if fingerprint in self._seen:
+                return False
+            self._seen.add(fingerprint)
+            return True
+
+    def __contains__(self, fingerprint: str) -> bool:
+        with self._lock:
+            return fingerprint in self._seen
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._seen)
+
+
+# 进程内共享：GUI 重复点击刷新等情况下，不同爬虫实例的相同请求也会合并；
+# 键包含会话身份，只有登录状态和出口都相同的请求才会合并
+single_flight = SingleFlight()
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, List
+
+from utils.serialize import dumps_str
+
+
+# 延迟直方图分桶上界（秒），与 Prometheus 默认分桶接近
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape_label(value: str) -> str:
+    """转义 Prometheus 标签值中的反斜杠、双引号和换行"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """累计分桶直方图"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 最后一个为 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for upper, n in zip(list(self.buckets) + ['+Inf'], self.counts):
+            running += n
+            cumulative.append([upper, running])
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'avg': round(self.total / self.count, 6) if self.count else 0.0,
+            'buckets': cumulative,
+        }
+
+
+class SpiderMetrics:
+    """
+    爬虫运行指标
+    记录请求延迟、流量、重试、状态码分布、各阶段耗时、吞吐和队列深度
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self.request_latency = Histogram()
+            self.stage_latency = defaultdict(Histogram)  # fetch / parse / render 等阶段
+            self.status_codes = defaultdict(int)
+            self.bytes_received = 0
+            self.retries = 0
+            self.items = 0
+            self.queue_depth = 0
+            self.max_queue_depth = 0
+            self.concurrency = {}  # 主机 -> 当前自适应并发窗口
+            self.started_at = time.time()
+
+    def observe_request(self, latency: float, status_code: int = None, nbytes: int = 0):
+        """记录一次HTTP请求，status_code 为 None 表示网络异常"""
+        with self._lock:
+            self.request_latency.observe(latency)
+            self.status_codes[str(status_code) if status_code is not None else 'error'] += 1
+            self.bytes_received += nbytes
+
+    def observe_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def observe_items(self, count: int):
+        with self._lock:
+            self.items += count
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stage_latency[stage].observe(seconds)
+
+    def set_queue_depth(self, depth: int):
+        with self._lock:
+            self.queue_depth = depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def set_concurrency(self, host: str, window: float):
+        with self._lock:
+            self.concurrency[host] = round(window, 2)
+
+    @contextmanager
+    def stage(self, stage: str):
+        """统计代码块耗时，如 with metrics.stage('parse'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前指标的字典快照"""
+        with self._lock:
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            return {
+                'spider': self.name,
+                'elapsed': round(elapsed, 3),
+                'requests': self.request_latency.to_dict(),
+                'status_codes': dict(self.status_codes),
+                'bytes_received': self.bytes_received,
+                'retries': self.retries,
+                'items': self.items,
+                'items_per_second': round(self.items / elapsed, 3),
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'concurrency': dict(self.concurrency),
+                'stages': {k: v.to_dict() for k, v in self.stage_latency.items()},
+            }
+
+    def summary(self) -> str:
+        """一行摘要，用于状态栏显示"""
+        snap = self.snapshot()
+        parts = [f"请求 {snap['requests']['count']} 次",
+                 f"平均 {snap['requests']['avg'] * 1000:.0f}ms",
+                 f"{snap['bytes_received'] / 1024:.0f}KB",
+                 f"{snap['items_per_second']:.1f} 条/秒"]
+        for stage, hist in snap['stages'].items():
+            parts.append(f"{stage} {hist['sum']:.2f}s")
+        return "，".join(parts)
+
+    def to_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        snap = self.snapshot()
+        label = f'spider="{_escape_label(self.name)}"'
+        lines: List[str] = []
+
+        def histogram(metric, hist, extra=""):
+            labels = label + extra
+            for upper, n in hist['buckets']:
+                lines.append(f'{metric}_bucket{{{labels},le="{upper}"}} {n}')
+            lines.append(f'{metric}_sum{{{labels}}} {hist["sum"]}')
+            lines.append(f'{metric}_count{{{labels}}} {hist["count"]}')
+
+        lines.append("# TYPE spider_request_duration_seconds histogram")
+        histogram("spider_request_duration_seconds", snap['requests'])
+
+        lines.append("# TYPE spider_stage_duration_seconds histogram")
+        for stage, hist in snap['stages'].items():
+            histogram("spider_stage_duration_seconds", hist, f',stage="{stage}"')
+
+        lines.append("# TYPE spider_responses_total counter")
+        for code, n in snap['status_codes'].items():
+            lines.append(f'spider_responses_total{{{label},code="{code}"}} {n}')
+
+        for metric, key, kind in (("spider_bytes_received_total", 'bytes_received', 'counter'),
+                                  ("spider_retries_total", 'retries', 'counter'),
+                                  ("spider_items_total", 'items', 'counter'),
+                                  ("spider_items_per_second", 'items_per_second', 'gauge'),
+                                  ("spider_queue_depth", 'queue_depth', 'gauge'),
+                                  ("spider_max_queue_depth", 'max_queue_depth', 'gauge')):
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{{{label}}} {snap[key]}")
+
+        lines.append("# TYPE spider_concurrency_window gauge")
+        for host, window in snap['concurrency'].items():
+            lines.append(f'spider_concurrency_window{{{label},host="{_escape_label(host)}"}} {window}')
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """
+        导出指标文件，按扩展名选择格式
+
+        Args:
+            path: .json 导出为 JSON，其他（如 .prom）导出为 Prometheus 文本
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith('.json'):
+            content = dumps_str(self.snapshot())
+        else:
+            content = self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
@@ -0,0 +1,167 @@
+# order.py
+
+import hashlib
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Optional
+
+from utils.serialize import dumps
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_time(text: Optional[str]) -> Optional[int]:
+    """'2025-10-20 10:30:00' -> 本地时间的 epoch 秒，无法解析返回 None"""
+    if not text:
+        return None
+    try:
+        return int(time.mktime(time.strptime(text.strip(), TIME_FORMAT)))
+    except (ValueError, OverflowError):
+        return None
+
+
+def to_cents(amount: Any) -> Optional[int]:
+    """金额（元）转为整数分，避免浮点误差"""
+    if amount is None or amount == "":
+        return None
+    try:
+        return int((Decimal(str(amount)) * 100).to_integral_value())
+    except (InvalidOperation, ValueError, OverflowError):
+        return None
+
+
+def content_hash(item: Any) -> str:
+    """
+    订单内容的稳定哈希，字段顺序不影响结果，任一字段变化都会改变哈希
+
+    Args:
+        item: 订单字典或 Order
+    """
+    if hasattr(item, 'to_dict'):
+        item = item.to_dict()
+    return hashlib.blake2b(dumps(item, sort_keys=True), digest_size=16).hexdigest()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """取值有限的字符串（状态、支付方式、店铺）驻留，重复值共享同一对象"""
+    return sys.intern(value) if value else value
+
+
+class Order:
+    """
+    规范化后的订单记录
+    使用 __slots__ 节省内存，时间为 epoch 秒、金额为整数分、数量为整数
+    同时提供与原订单字典兼容的 get()/[] 访问
+    """
+
+    __slots__ = ('order_id', 'order_url', 'order_ts', 'shop_name', 'product_name', 'product_url',
+                 'product_image', 'quantity', 'consignee', 'address', 'phone', 'amount_cents',
+                 'payment_method', 'status', 'invoice_url', 'extra')
+
+    # 与 jd_parse_order 输出一致的字段顺序
+    FIELDS = ('order_id', 'order_url', 'order_time', 'shop_name', 'product_name', 'product_url',
+              'product_image', 'quantity', 'consignee', 'address', 'phone', 'amount',
+              'payment_method', 'status', 'invoice_url')
+
+    def __init__(self, order_id: str, order_url: str = None, order_ts: int = None, shop_name: str = None,
+                 product_name: str = None, product_url: str = None, product_image: str = None,
+                 quantity: int = None, consignee: str = None, address: str = None, phone: str = None,
+                 amount_cents: int = None, payment_method: str = None, status: str = None,
+                 invoice_url: str = None, extra: Dict[str, Any] = None):
+        self.order_id = order_id
+        self.order_url = order_url
+        self.order_ts = order_ts
+        self.shop_name = _intern(shop_name)
+        self.product_name = product_name
+        self.product_url = product_url
+        self.product_image = product_image
+        self.quantity = quantity
+        self.consignee = consignee
+        self.address = address
+        self.phone = phone
+        self.amount_cents = amount_cents
+        self.payment_method = _intern(payment_method)
+        self.status = _intern(status)
+        self.invoice_url = invoice_url
+        # 详情页补全等其他字段，没有时不分配字典
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> 'Order':
+        """从解析得到的订单字典构建"""
+        known = set(cls.FIELDS)
+        extra = {k: v for k, v in item.items() if k not in known}
+        quantity = item.get('quantity')
+        return cls(
+            order_id=item.get('order_id'),
+            order_url=item.get('order_url'),
+            order_ts=parse_time(item.get('order_time')),
+            shop_name=item.get('shop_name'),
+            product_name=item.get('product_name'),
+            product_url=item.get('product_url'),
+            product_image=item.get('product_image'),
+            quantity=int(quantity) if quantity is not None else None,
+            consignee=item.get('consignee'),
+            address=item.get('address'),
+            phone=item.get('phone'),
+            amount_cents=to_cents(item.get('amount')),
+            payment_method=item.get('payment_method'),
+            status=item.get('status'),
+            invoice_url=item.get('invoice_url'),
+            extra=extra,
+        )
+
+    @property
+    def order_time(self) -> Optional[str]:
+        """下单时间文本"""
+        if self.order_ts is None:
+            return None
+        return time.strftime(TIME_FORMAT, time.localtime(self.order_ts))
+
+    @property
+    def amount(self) -> Optional[Decimal]:
+        """实付金额（元）"""
+        if self.amount_cents is None:
+            return None
+        return Decimal(self.amount_cents).scaleb(-2)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """按原订单字典的字段名取值"""
+        if key in self.FIELDS:
+            value = getattr(self, key)
+        elif self.extra:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self):
+        return [k for k in self.FIELDS if self.get(k) is not None] + list(self.extra or ())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的订单字典（金额为元）"""
+        data = {}
+        for key in self.FIELDS:
+            value = self.get(key)
+            if value is not None:
+                data[key] = float(value) if key == 'amount' else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def content_hash(self) -> str:
+        """内容哈希，见 content_hash()"""
+        return content_hash(self.to_dict())
+
+    def __repr__(self):
+        return f"Order({self.order_id!r}, {self.order_time!r}, {self.product_name!r}, {self.amount})"
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any
+
+from service.storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    原始页面归档
+    每个页面压缩为独立的 gzip 帧追加到 pages.gz，SQLite 索引记录 URL、页码、抓取时间和帧位置
+    内容相同的页面只压缩保存一次
+    """
+
+    def __init__(self, root: str = None, compresslevel: int = 6):
+        """
+        Args:
+            root: 归档目录，默认 data/archive
+            compresslevel: gzip 压缩级别
+        """
+        self.root = root or os.path.join(DATA_DIR, "archive")
+        os.makedirs(self.root, exist_ok=True)
+        self.data_path = os.path.join(self.root, "pages.gz")
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(os.path.join(self.root, "index.db"), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                spider TEXT,
+                url TEXT NOT NULL,
+                page INTEGER,
+                fetched_at REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                encoding TEXT,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, page)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages (content_hash)")
+        self.conn.commit()
+
+    def append(self, url: str, content: bytes, spider: str = None, page: int = None, encoding: str = None):
+        """归档一个页面"""
+        content_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT offset, length FROM pages WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+            if row:
+                offset, length = row
+            else:
+                frame = gzip.compress(content, self.compresslevel)
+                with open(self.data_path, 'ab') as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(frame)
+                length = len(frame)
+
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO pages (spider, url, page, fetched_at, content_hash, encoding, offset, length) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (spider, url, page, time.time(), content_hash, encoding, offset, length))
+
+    def entries(self, spider: str = None, latest_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        列出归档条目
+
+        Args:
+            spider: 只列出该爬虫抓取的页面
+            latest_only: 每个 URL/页码只保留最近一次抓取
+        """
+        sql = "SELECT id, spider, url, page, fetched_at, content_hash, encoding, offset, length FROM pages"
+        params = []
+        if spider:
+            sql += " WHERE spider = ?"
+            params.append(spider)
+        sql += " ORDER BY fetched_at"
+        columns = ['id', 'spider', 'url', 'page', 'fetched_at', 'content_hash', 'encoding', 'offset', 'length']
+        rows = [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+        if latest_only:
+            latest = {}
+            for row in rows:
+                latest[(row['spider'], row['url'], row['page'])] = row
+            rows = list(latest.values())
+        return rows
+
+    def read(self, entry: Dict[str, Any]) -> bytes:
+        """读取归档条目的原始内容"""
+        return read_frame(self.data_path, entry['offset'], entry['length'])
+
+    def close(self):
+        self.conn.close()
+
+
+def read_frame(data_path: str, offset: int, length: int) -> bytes:
+    """从归档文件读取并解压一帧"""
+    with open(data_path, 'rb') as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length))
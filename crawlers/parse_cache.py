@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Callable
+
+from service.storage import DATA_DIR
+from utils.serialize import dumps_str, loads
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(content: bytes) -> str:
+    """响应内容的快速哈希"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """
+    解析结果缓存
+    以响应内容哈希为键保存解析结果，内容不变的页面直接返回缓存，不再构建 DOM
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = 5000):
+        """
+        Args:
+            db_path: 缓存数据库路径，默认 data/parse_cache.db
+            max_entries: 最多保留的条目数，超出时淘汰最久未使用的
+        """
+        self.db_path = db_path or os.path.join(DATA_DIR, "parse_cache.db")
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._invalidated = set()
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                parser_version TEXT NOT NULL,
+                items TEXT NOT NULL,
+                last_used REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_used ON parse_cache (last_used)")
+        self.conn.commit()
+
+    def invalidate(self, namespace: str, parser_version: str):
+        """删除该解析器旧版本的缓存"""
+        with self._lock, self.conn:
+            deleted = self.conn.execute(
+                "DELETE FROM parse_cache WHERE namespace = ? AND parser_version != ?",
+                (namespace, parser_version)).rowcount
+            self._invalidated.add((namespace, parser_version))
+        if deleted:
+            logger.info("解析器 %s 已更新到 %s，清除 %d 条旧缓存", namespace, parser_version, deleted)
+
+    def get_or_parse(self,
+                     content: bytes,
+                     namespace: str,
+                     parser_version: str,
+                     parse: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        命中缓存时直接返回，否则调用 parse 并写入缓存
+
+        Args:
+            content: 响应原始内容
+            namespace: 解析器命名空间（一般为爬虫名）
+            parser_version: 解析器版本，解析逻辑变化时必须修改
+            parse: 实际解析函数
+        """
+        if (namespace, parser_version) not in self._invalidated:
+            self.invalidate(namespace, parser_version)
+
+        key = f"{namespace}:{parser_version}:{content_key(content)}"
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT items FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.hits += 1
+                self.conn.execute("UPDATE parse_cache SET last_used = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                return loads(row[0])
+            self.misses += 1
+
+        items = parse()
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, namespace, parser_version, items, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, parser_version, dumps_str(items), now))
+            self._evict()
+        return items
+
+    def _evict(self):
+        """超出容量时淘汰最久未使用的条目"""
+        count = self.conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM parse_cache WHERE key IN "
+                "(SELECT key FROM parse_cache ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# 请求优先级，数值越小越优先
+PRIORITY_LIST = 0    # 订单列表页，用户正在等待
+PRIORITY_DETAIL = 1  # 订单详情补全
+PRIORITY_ASSET = 2   # 图片、发票等附件
+
+# 各优先级最多占用的并发比例，低优先级留出余量，后台任务运行时列表页仍能立即得到名额
+DEFAULT_SHARES = {
+    PRIORITY_LIST: 1.0,
+    PRIORITY_DETAIL: 0.5,
+    PRIORITY_ASSET: 0.25,
+}
+
+
+class DeadlineExceeded(Exception):
+    """请求在截止时间前没有排到"""
+
+
+class RequestCancelled(Exception):
+    """请求在排队期间被取消"""
+
+
+class _Waiter:
+    __slots__ = ('priority', 'granted', 'cancelled')
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.granted = False
+        self.cancelled = False
+
+
+class RequestScheduler:
+    """
+    全局请求调度
+    所有爬虫请求共享固定数量的并发名额：按优先级排队，同一优先级内截止时间早的先执行；
+    每个优先级的占用不超过其份额，空出的名额总是先给优先级高的请求
+    """
+
+    def __init__(self, capacity: int = 8, shares: Dict[int, float] = None):
+        """
+        Args:
+            capacity: 全部爬虫同时进行的最大请求数
+            shares: {优先级: 最多占用的并发比例}，未列出的优先级不受限
+        """
+        self.capacity = max(capacity, 1)
+        self.shares = dict(DEFAULT_SHARES if shares is None else shares)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._in_use: Dict[int, int] = {}
+        self._total = 0
+        self.waited: Dict[int, float] = {}  # 各优先级累计排队时间
+        self.expired = 0
+
+    def _limit(self, priority: int) -> int:
+        share = self.shares.get(priority, 1.0)
+        return max(1, math.floor(self.capacity * share))
+
+    def _dispatch(self):
+        """按优先级把空闲名额分给排队的请求，调用时必须持有锁"""
+        skipped = []
+        granted = False
+        while self._queue and self._total < self.capacity:
+            item = heapq.heappop(self._queue)
+            waiter = item[-1]
+            if waiter.cancelled:
+                continue
+            if self._in_use.get(waiter.priority, 0) >= self._limit(waiter.priority):
+                skipped.append(item)
+                continue
+            waiter.granted = True
+            self._in_use[waiter.priority] = self._in_use.get(waiter.priority, 0) + 1
+            self._total += 1
+            granted = True
+        for item in skipped:
+            heapq.heappush(self._queue, item)
+        if granted:
+            self._cond.notify_all()
+
+    def acquire(self, priority: int = PRIORITY_LIST, deadline: float = None):
+        """
+        排队获取一个并发名额
+
+        Args:
+            priority: 优先级
+            deadline: 截止时间（time.monotonic()），到期仍未排到时抛出 DeadlineExceeded
+        """
+        start = time.monotonic()
+        with self._cond:
+            waiter = _Waiter(priority)
+            heapq.heappush(self._queue, (priority, deadline if deadline is not None else math.inf,
+                                         next(self._seq), waiter))
+            self._dispatch()
+            while not waiter.granted:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    waiter.cancelled = True
+                    self.expired += 1
+                    raise DeadlineExceeded(f"优先级 {priority} 的请求排队超时")
+                self._cond.wait(timeout)
+            self.waited[priority] = self.waited.get(priority, 0.0) + time.monotonic() - start
+
+    def release(self, priority: int = PRIORITY_LIST):
+        with self._cond:
+            self._in_use[priority] -= 1
+            self._total -= 1
+            self._dispatch()
+
+    def slot(self, priority: int = PRIORITY_LIST, deadline: float = None) -> 'SchedulerSlot':
+        """with scheduler.slot(priority): ..."""
+        return SchedulerSlot(self, priority, deadline)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            queued: Dict[int, int] = {}
+            for item in self._queue:
+                if not item[-1].cancelled:
+                    queued[item[0]] = queued.get(item[0], 0) + 1
+            return {
+                'capacity': self.capacity,
+                'in_use': dict(self._in_use),
+                'queued': queued,
+                'waited': {p: round(s, 3) for p, s in self.waited.items()},
+                'expired': self.expired,
+            }
+
+
+class SchedulerSlot:
+    def __init__(self, scheduler: RequestScheduler, priority: int, deadline: float = None):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.deadline = deadline
+
+    def __enter__(self):
+        self.scheduler.acquire(self.priority, self.deadline)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.scheduler.release(self.priority)
+        return False
+
+
+# 进程内共享，所有爬虫的请求都经过同一个调度器
+scheduler = RequestScheduler()
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Callable
+
+from utils.serialize import append_jsonl
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlSink(ABC):
+    """
+    爬取结果的接收端
+    数据边产生边写入缓冲区，达到 batch_size 条或最早一条等待超过 max_age 秒时批量落盘，
+    爬取过程中内存占用只与批大小有关；中途崩溃最多丢失一个批次
+    """
+
+    def __init__(self, batch_size: int = 200, max_age: float = 5.0):
+        """
+        Args:
+            batch_size: 每批写入的条数
+            max_age: 缓冲数据最长等待时间（秒）
+        """
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self._buffer: List[Any] = []
+        self._buffer_since = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.items = 0
+        self.batches = 0
+        self.written = 0
+
+    @abstractmethod
+    def write_batch(self, batch: List[Any]) -> int:
+        """
+        写入一批数据 - 必须实现
+
+        Returns:
+            实际写入的条数
+        """
+        pass
+
+    def add(self, item: Any):
+        self.add_many([item])
+
+    def add_many(self, items: Iterable[Any]):
+        """加入数据，必要时触发批量写入"""
+        with self._lock:
+            for item in items:
+                if not self._buffer:
+                    self._buffer_since = time.monotonic()
+                self._buffer.append(item)
+                self.items += 1
+            due = len(self._buffer) >= self.batch_size or (
+                self._buffer and time.monotonic() - self._buffer_since >= self.max_age)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """写入缓冲区中的全部数据"""
+        # 写入在缓冲区锁之外进行，写入期间其他线程仍可继续加入数据
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            for i in range(0, len(batch), self.batch_size):
+                written = self.write_batch(batch[i:i + self.batch_size])
+                self.batches += 1
+                self.written += written or 0
+
+    def close(self):
+        self.flush()
+
+    def summary(self) -> Dict[str, int]:
+        """{'items': 接收条数, 'written': 写入条数, 'batches': 批次数}"""
+        return {'items': self.items, 'written': self.written, 'batches': self.batches}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CallbackSink(CrawlSink):
+    """每批数据交给回调函数处理"""
+
+    def __init__(self, callback: Callable[[List[Any]], Any], **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+
+    def write_batch(self, batch: List[Any]) -> int:
+        self.callback(batch)
+        return len(batch)
+
+
+class OrderStoreSink(CrawlSink):
+    """批量写入 OrderStore"""
+
+    def __init__(self, store, **kwargs):
+        """
+        Args:
+            store: OrderStore 实例
+        """
+        super().__init__(**kwargs)
+        self.store = store
+
+    def write_batch(self, batch: List[Any]) -> int:
+        return self.store.upsert_many(batch)
+
+
+class JsonLinesSink(CrawlSink):
+    """每批数据追加写入 JSON Lines 文件"""
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Args:
+            path: 输出文件，已存在时追加
+        """
+        super().__init__(**kwargs)
+        self.path = path
+
+    def write_batch(self, batch: List[Any]) -> int:
+        return append_jsonl(self.path, batch)
+
+
+class DedupSink:
+    """按键去重后转交给另一个 sink，只保存见过的键"""
+
+    def __init__(self, sink: CrawlSink, key: str = 'order_id'):
+        self.sink = sink
+        self.key = key
+        self.duplicates = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def add(self, item: Any):
+        self.add_many([item])
+
+    def add_many(self, items: Iterable[Any]):
+        unique = []
+        with self._lock:
+            for item in items:
+                value = item.get(self.key)
+                if value is not None and value in self._seen:
+                    self.duplicates += 1
+                    continue
+                if value is not None:
+                    self._seen.add(value)
+                unique.append(item)
+        self.sink.add_many(unique)
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.close()
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.sink.summary(), duplicates=self.duplicates)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
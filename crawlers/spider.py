@@ -1,19 +1,85 @@
 # spider.py
 
+import logging
 import re
-
-from typing import  Dict, Any
-
-from bs4 import BeautifulSoup
-
-from crawlers.base_spider import SimpleSpider   # 假设 BaseSpider 在 crawlers/base_spider.py
-
-
-
-def jd_parse_order(response) -> Dict[str, Any]:
-    """从单个订单 tbody 中提取信息（私有方法）"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from typing import  Dict, Any, List, Iterable, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from crawlers.base_spider import SimpleSpider, SessionExpiredError   # 假设 BaseSpider 在 crawlers/base_spider.py
+from crawlers.fingerprint import SeenSet
+from crawlers.scheduler import PRIORITY_DETAIL
+from crawlers.sink import CrawlSink, DedupSink
+from crawlers.order import Order
+
+logger = logging.getLogger(__name__)
+
+# 解析逻辑修改后递增，使旧的解析缓存失效
+JD_PARSER_VERSION = "2"
+JD_DETAIL_PARSER_VERSION = "1"
+
+# 京东登录页域名和页面特征
+JD_LOGIN_HOSTS = ('passport.jd.com',)
+JD_LOGIN_MARKERS = (b'passport.jd.com/new/login', b'passport.jd.com/uc/login?ReturnUrl')
+
+# 订单列表的时间筛选参数 d：1 近三个月，2 今年内，YYYY 某一年，3 更早的订单
+JD_TIME_PARAM = 'd'
+JD_RECENT = 1
+JD_THIS_YEAR = 2
+JD_OLDER = 3
+# 按年份筛选支持的最早年份，更早的订单都在 JD_OLDER 分区
+JD_EARLIEST_YEAR = 2015
+
+
+def jd_time_partitions(since_year: int = None, include_older: bool = None) -> List[int]:
+    """
+    按年份把订单历史切分为京东时间筛选分区，从新到旧排列
+
+    Args:
+        since_year: 最早爬取的年份，默认 JD_EARLIEST_YEAR；只重爬最近的分区时传入当前年份
+        include_older: 是否包含 JD_EARLIEST_YEAR 之前的订单，默认未指定 since_year 时包含
+
+    Returns:
+        d 参数取值列表，如 [2, 2025, 2024, ..., 3]
+    """
+    if include_older is None:
+        include_older = since_year is None
+    since_year = max(since_year or JD_EARLIEST_YEAR, JD_EARLIEST_YEAR)
+    this_year = date.today().year
+    partitions = [JD_THIS_YEAR] + list(range(this_year - 1, since_year - 1, -1))
+    if include_older:
+        partitions.append(JD_OLDER)
+    return partitions
+
+
+# jd_parse_order 能提取的全部字段
+JD_ORDER_FIELDS = ('order_id', 'order_url', 'order_time', 'shop_name', 'product_name', 'product_url',
+                   'product_image', 'quantity', 'consignee', 'address', 'phone', 'amount', 'payment_method',
+                   'status', 'invoice_url')
+
+# 只解析订单 tbody，其余页面结构不建树
+_ORDER_TBODY = SoupStrainer('tbody', id=re.compile(r'^tb-'))
+
+
+def jd_parse_order(response, fields: Iterable[str] = None) -> List[Dict[str, Any]]:
+    """
+    从订单列表页提取订单信息
+
+    Args:
+        response: 响应对象
+        fields: 需要的字段，None 表示全部；未请求的字段不做对应的 DOM 查找。order_id 总会提取
+    """
+    fields = set(JD_ORDER_FIELDS if fields is None else fields) | {'order_id'}
+    want_goods = not fields.isdisjoint({'product_name', 'product_url', 'product_image', 'quantity'})
+    want_consignee = not fields.isdisjoint({'consignee', 'address', 'phone'})
+    want_amount = not fields.isdisjoint({'amount', 'payment_method'})
 
     def func(tbody):
+        """从单个订单 tbody 中提取信息"""
         try:
             order = {}
 
@@ -25,83 +91,114 @@ def jd_parse_order(response) -> Dict[str, Any]:
             order_link = tr_th.find('a', {'name': 'orderIdLinks'})
             if order_link:
                 order['order_id'] = order_link.text.strip()
-                order['order_url'] = order_link.get('href', '')
+                if 'order_url' in fields:
+                    order['order_url'] = order_link.get('href', '')
 
             # 订单时间
-            dealtime_span = tr_th.find('span', class_='dealtime')
-            if dealtime_span:
-                order['order_time'] = dealtime_span.get('title', '').strip()
+            if 'order_time' in fields:
+                dealtime_span = tr_th.find('span', class_='dealtime')
+                if dealtime_span:
+                    order['order_time'] = dealtime_span.get('title', '').strip()
 
             # 店铺名称
-            shop_span = tr_th.find('span', class_='order-shop')
-            if shop_span:
-                shop_link = shop_span.find('a', class_='shop-txt')
-                if shop_link:
-                    order['shop_name'] = shop_link.text.strip()
+            if 'shop_name' in fields:
+                shop_span = tr_th.find('span', class_='order-shop')
+                if shop_span:
+                    shop_link = shop_span.find('a', class_='shop-txt')
+                    if shop_link:
+                        order['shop_name'] = shop_link.text.strip()
 
             # 商品信息
             tr_bd = tbody.find('tr', class_='tr-bd')
             if tr_bd:
-                goods_item = tr_bd.find('div', class_='goods-item')
+                goods_item = tr_bd.find('div', class_='goods-item') if want_goods else None
                 if goods_item:
-                    product_name = goods_item.find('a', class_='a-link')
-                    if product_name:
-                        order['product_name'] = product_name.get('title', '').strip()
-                        order['product_url'] = "https:" + product_name.get('href', '')
+                    if 'product_name' in fields or 'product_url' in fields:
+                        product_name = goods_item.find('a', class_='a-link')
+                        if product_name:
+                            if 'product_name' in fields:
+                                order['product_name'] = product_name.get('title', '').strip()
+                            if 'product_url' in fields:
+                                order['product_url'] = "https:" + product_name.get('href', '')
+
+                    # 商品图片
+                    if 'product_image' in fields:
+                        product_img = goods_item.find('img')
+                        if product_img:
+                            img_src = product_img.get('data-lazy-img') or product_img.get('src', '')
+                            if img_src.startswith('//'):
+                                img_src = "https:" + img_src
+                            if img_src:
+                                order['product_image'] = img_src
 
                     # 商品数量
-                    goods_number = goods_item.find_next_sibling('div', class_='goods-number')
-                    if goods_number:
-                        quantity_text = goods_number.text.strip()
-                        match = re.search(r'x(\d+)', quantity_text)
-                        if match:
-                            order['quantity'] = int(match.group(1))
+                    if 'quantity' in fields:
+                        goods_number = goods_item.find_next_sibling('div', class_='goods-number')
+                        if goods_number:
+                            quantity_text = goods_number.text.strip()
+                            match = re.search(r'x(\d+)', quantity_text)
+                            if match:
+                                order['quantity'] = int(match.group(1))
 
                 # 收货人
-                consignee_div = tr_bd.find('div', class_='consignee')
+                consignee_div = tr_bd.find('div', class_='consignee') if want_consignee else None
                 if consignee_div:
-                    consignee_span = consignee_div.find('span', class_='txt')
-                    if consignee_span:
-                        order['consignee'] = consignee_span.text.strip()
-
-                    prompt_div = consignee_div.find('div', class_='prompt-01')
+                    if 'consignee' in fields:
+                        consignee_span = consignee_div.find('span', class_='txt')
+                        if consignee_span:
+                            order['consignee'] = consignee_span.text.strip()
+
+                    prompt_div = None
+                    if 'address' in fields or 'phone' in fields:
+                        prompt_div = consignee_div.find('div', class_='prompt-01')
                     if prompt_div:
-                        address_p = prompt_div.find('p')
-                        if address_p:
-                            order['address'] = address_p.text.strip()
+                        paragraphs = prompt_div.find_all('p')
+                        if paragraphs and 'address' in fields:
+                            order['address'] = paragraphs[0].text.strip()
 
-                        phone_p = prompt_div.find_all('p')[-1]
-                        if phone_p and '****' in phone_p.text:
-                            order['phone'] = phone_p.text.strip()
+                        if paragraphs and 'phone' in fields and '****' in paragraphs[-1].text:
+                            order['phone'] = paragraphs[-1].text.strip()
 
                 # 订单金额
-                amount_div = tr_bd.find('div', class_='amount')
+                amount_div = tr_bd.find('div', class_='amount') if want_amount else None
                 if amount_div:
-                    amount_span = amount_div.find('span')
-                    if amount_span:
-                        amount_text = amount_span.text.strip()
-                        match = re.search(r'[¥￥]?(\d+\.?\d*)', amount_text)
-                        if match:
-                            order['amount'] = float(match.group(1))
-
-                    pay_span = amount_div.find('span', class_='ftx-13')
-                    if pay_span:
-                        order['payment_method'] = pay_span.text.strip()
+                    if 'amount' in fields:
+                        amount_span = amount_div.find('span')
+                        if amount_span:
+                            amount_text = amount_span.text.strip()
+                            match = re.search(r'[¥￥]?(\d+\.?\d*)', amount_text)
+                            if match:
+                                order['amount'] = float(match.group(1))
+
+                    if 'payment_method' in fields:
+                        pay_span = amount_div.find('span', class_='ftx-13')
+                        if pay_span:
+                            order['payment_method'] = pay_span.text.strip()
 
                 # 订单状态
-                status_div = tr_bd.find('div', class_='status')
-                if status_div:
-                    status_span = status_div.find('span', class_='order-status')
-                    if status_span:
-                        order['status'] = status_span.text.strip()
+                if 'status' in fields:
+                    status_div = tr_bd.find('div', class_='status')
+                    if status_div:
+                        status_span = status_div.find('span', class_='order-status')
+                        if status_span:
+                            order['status'] = status_span.text.strip()
+
+                # 发票链接
+                operate_div = tr_bd.find('div', class_='operate') if 'invoice_url' in fields else None
+                if operate_div:
+                    for link in operate_div.find_all('a', href=True):
+                        if '发票' in link.text:
+                            invoice_href = link['href']
+                            order['invoice_url'] = "https:" + invoice_href if invoice_href.startswith('//') else invoice_href
+                            break
 
             return order
 
         except Exception as e:
-            print(f"解析单个订单时出错: {e}")
+            logger.warning("解析单个订单时出错: %s", e)
             return {}
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.text, 'html.parser', parse_only=_ORDER_TBODY)
     orders = []
 
     # 查找所有订单的 tbody 元素
@@ -114,12 +211,148 @@ def jd_parse_order(response) -> Dict[str, Any]:
     return orders
 
 
+def jd_parse_order_detail(response) -> Dict[str, Any]:
+    """从订单详情页提取全部商品行、物流和发票信息"""
+    soup = BeautifulSoup(response.text, 'html.parser')
+    detail = {}
+
+    # 商品行：每个商品一行 tr.product-<skuId>
+    items = []
+    for tr in soup.find_all('tr', class_=re.compile(r'^product-')):
+        try:
+            item = {}
+            name_link = tr.select_one('div.p-name a')
+            if name_link:
+                item['product_name'] = (name_link.get('title') or name_link.text).strip()
+                href = name_link.get('href', '')
+                item['product_url'] = "https:" + href if href.startswith('//') else href
+
+            price_span = tr.find('span', class_='f-price')
+            price_text = price_span.text if price_span else tr.get_text(' ')
+            match = re.search(r'[¥￥](\d+\.?\d*)', price_text)
+            if match:
+                item['price'] = float(match.group(1))
+
+            for td in tr.find_all('td'):
+                text = td.text.strip()
+                if re.fullmatch(r'x?(\d+)', text):
+                    item['quantity'] = int(text.lstrip('x'))
+                    break
+
+            if item:
+                items.append(item)
+        except Exception as e:
+            logger.warning("解析订单商品行时出错: %s", e)
+
+    if items:
+        detail['items'] = items
+
+    # 物流信息：取最新一条跟踪记录
+    track = soup.find('div', class_='track-rcol') or soup.find('div', id='track')
+    if track:
+        latest = track.find('li')
+        detail['logistics'] = (latest or track).get_text(' ', strip=True)
+
+    # 发票信息
+    invoice = soup.find('div', class_='invoice-info') or soup.find('div', class_='invoice')
+    if invoice:
+        detail['invoice'] = invoice.get_text(' ', strip=True)
 
+    return detail
+
+
+class DetailSpider(SimpleSpider):
+    """订单详情补全：并发抓取详情页，把全部商品行合并进本地订单库"""
+
+    parser_version = JD_DETAIL_PARSER_VERSION
+    priority = PRIORITY_DETAIL
+    login_hosts = JD_LOGIN_HOSTS
+    login_markers = JD_LOGIN_MARKERS
+
+    # 从订单列表页需要拿到的字段
+    REQUIRED_FIELDS = ('order_id', 'order_url', 'status')
+
+    # 不会再变化的订单状态，补全过一次后不再抓取
+    FINAL_STATUSES = {'已完成', '已取消', '已签收', '已删除'}
+
+    def __init__(self, store, max_age: float = 24 * 3600, **kwargs):
+        """
+        Args:
+            store: OrderStore 实例
+            max_age: 未完结订单的详情过期时间（秒）
+        """
+        super().__init__(**kwargs)
+        self.store = store
+        self.max_age = max_age
+
+    def parse(self, response):
+        return [jd_parse_order_detail(response)]
+
+    def select_orders(self, orders: List[Dict[str, Any]], limit: int = None) -> List[Dict[str, Any]]:
+        """挑出需要补全的订单：从未补全，或未完结且详情已过期"""
+        meta = self.store.get_meta(o['order_id'] for o in orders if o.get('order_id'))
+        now = time.time()
+        selected = []
+        for order in orders:
+            if not order.get('order_url') or not order.get('order_id'):
+                continue
+            enriched_at = meta.get(order['order_id'], {}).get('enriched_at')
+            if enriched_at:
+                if order.get('status') in self.FINAL_STATUSES:
+                    continue
+                if now - enriched_at < self.max_age:
+                    continue
+            selected.append(order)
+            if limit and len(selected) >= limit:
+                break
+        return selected
+
+    def enrich(self, orders: List[Dict[str, Any]], limit: int = None) -> int:
+        """
+        补全订单详情
+
+        Args:
+            orders: jd_parse_order 解析出的订单列表
+            limit: 本次最多补全的订单数
+
+        Returns:
+            成功补全的订单数
+        """
+        self.before_start()
+
+        selected = self.select_orders(orders, limit)
+        url_to_ids = {}
+        for order in selected:
+            url = order['order_url']
+            url = ("https:" + url) if url.startswith('//') else url
+            url_to_ids.setdefault(url, []).append(order['order_id'])
+        self.logger.info("需补全 %d/%d 个订单", len(selected), len(orders))
+
+        enriched = []
+        for url, response in self.request_many(list(url_to_ids)):
+            if response is None:
+                continue
+            try:
+                with self.metrics.stage('parse'):
+                    detail = self.parse_response(response)[0]
+            except Exception as e:
+                self.logger.error("解析详情失败 %s: %s", url, e)
+                continue
+            for order_id in url_to_ids[url]:
+                self.store.merge_detail(order_id, detail)
+                enriched.append(detail)
+
+        self.after_finish(enriched)
+        return len(enriched)
 
 
 class DebugSpider(SimpleSpider):
     """调试用的爬虫，查看实际返回内容"""
 
+    parser_version = JD_PARSER_VERSION
+    login_hosts = JD_LOGIN_HOSTS
+    login_markers = JD_LOGIN_MARKERS
+
     def parse(self, response):
         """
         调试解析方法，查看实际返回内容
@@ -152,18 +385,32 @@ class DebugSpider(SimpleSpider):
 
 
         # 返回空数据，因为我们只是调试
-        return jd_parse_order(response)
+        return jd_parse_order(response, self.fields)
+
+    def normalize_item(self, item):
+        """订单字典转换为紧凑的 Order 记录"""
+        return Order.from_dict(item)
 
     def before_start(self):
         super().before_start()
 
         self.session.headers.update({"referer":f"https://order.jd.com/center/list.action?page=1"})
 
-    def crawl_all_pages(self, base_url, **request_kwargs):
-        """自动爬取所有页面数据"""
+    def crawl_all_pages(self, base_url, seen: SeenSet = None, sink: CrawlSink = None, **request_kwargs):
+        """
+        自动爬取所有页面数据
+
+        Args:
+            seen: 本次爬取已请求过的指纹，多个翻页链共享时跳过彼此请求过的页面
+            sink: CrawlSink 实例，每页数据直接分批写入，不在内存中累积
+
+        Returns:
+            所有页面的数据；指定 sink 时返回 sink.summary()
+        """
         all_data = []
         page = 1
-        while True:
+        seen = seen if seen is not None else SeenSet()
+        while not self.cancelled():
             # 更新参数中的页码
             params = request_kwargs.get('params', {}).copy()
             params['page'] = page
@@ -171,38 +418,111 @@ class DebugSpider(SimpleSpider):
 
             # print(f"正在爬取第 {page} 页...")
 
+            if not seen.add(self.fingerprint(base_url, **request_kwargs)):
+                self._incr_stat('duplicate_requests')
+                self.logger.info("第 %d 页已请求过，停止翻页", page)
+                break
 
             response = self.request(base_url, **request_kwargs)
 
             if response:
                 try:
-                    items = self.parse(response)
+                    with self.metrics.stage('parse'):
+                        items = self.parse_response(response)
                     if not items:  # 如果当前页没有数据，说明已经到最后一页
-                        print(f"第 {page} 页没有数据，爬取完成")
+                        self.logger.info("第 %d 页没有数据，爬取完成", page)
                         break
 
                     processed_items = []
                     for item in items:
-                        processed_item = self.process_item(item)
+                        processed_item = self.normalize_item(self.process_item(item))
                         processed_items.append(processed_item)
 
-                    all_data.extend(processed_items)
-                    print(f"从第 {page} 页解析出 {len(processed_items)} 条数据")
+                    self.metrics.observe_items(len(processed_items))
+                    if sink is not None:
+                        sink.add_many(processed_items)
+                    else:
+                        all_data.extend(processed_items)
+                    self.logger.info("从第 %d 页解析出 %d 条数据", page, len(processed_items))
 
                     page += 1
 
                 except Exception as e:
-                    print(f"解析第 {page} 页失败: {e}")
+                    self.logger.error("解析第 %d 页失败: %s", page, e)
                     break
             else:
-                print(f"请求第 {page} 页失败，停止爬取")
+                self.logger.warning("请求第 %d 页失败，停止爬取", page)
                 break
 
+        if sink is not None:
+            sink.flush()
+            return sink.summary()
         return all_data
 
+    def crawl_partitioned(self, base_url, partitions: List[Any] = None, max_workers: int = None,
+                          sink: CrawlSink = None, **request_kwargs) -> Union[List[Any], Dict[str, int]]:
+        """
+        按时间分区并发爬取：每个分区独立翻页，结果按 order_id 合并去重
+
+        Args:
+            base_url: 订单列表地址
+            partitions: 时间筛选参数 d 的取值，默认 jd_time_partitions() 覆盖全部历史
+            max_workers: 同时爬取的分区数，默认使用 self.max_workers
+            sink: CrawlSink 实例，各分区的数据按 order_id 去重后直接分批写入，不在内存中累积
+            **request_kwargs: 传给 crawl_all_pages 的参数
+
+        Returns:
+            去重后的订单，按分区从新到旧排列；指定 sink 时返回 sink.summary()
+        """
+        if partitions is None:
+            partitions = jd_time_partitions()
+        base_params = request_kwargs.pop('params', None) or {}
+
+        seen = SeenSet()
+        dedup_sink = DedupSink(sink, 'order_id') if sink is not None else None
+
+        def crawl_partition(partition):
+            params = dict(base_params, **{JD_TIME_PARAM: partition})
+            return self.crawl_all_pages(base_url, seen=seen, sink=dedup_sink, params=params, **request_kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            futures = [executor.submit(crawl_partition, partition) for partition in partitions]
+            self.metrics.set_queue_depth(len(futures))
+            results = []
+            try:
+                for partition, future in zip(partitions, futures):
+                    results.append(future.result())
+                    self.metrics.set_queue_depth(len(futures) - len(results))
+                    self.logger.info("分区 %s 爬取完成", partition)
+            except BaseException:
+                # 登录失效等错误时不再启动剩余分区
+                for future in futures:
+                    future.cancel()
+                raise
+
+        if dedup_sink is not None:
+            summary = dedup_sink.summary()
+            self.logger.info("%d 个分区写入 %d 个订单，跳过重复 %d 条",
+                             len(partitions), summary['written'], summary['duplicates'])
+            return summary
+
+        # 分区之间可能重叠（如近三个月与今年内），同一订单保留较新分区的结果
+        merged = {}
+        for items in results:
+            for item in items:
+                order_id = item.get('order_id')
+                if order_id and order_id not in merged:
+                    merged[order_id] = item
+        self.logger.info("%d 个分区共 %d 条，去重后 %d 个订单",
+                         len(partitions), sum(len(items) for items in results), len(merged))
+        return list(merged.values())
+
 
 # 使用示例
 if __name__ == "__main__":
+    from utils.log import setup_logging
+    setup_logging(logging.DEBUG)
+
     # 使用调试爬虫
     debug_spider = DebugSpider()
     debug_spider.set_headers({
@@ -225,4 +545,12 @@ if __name__ == "__main__":
     }
 
     data = debug_spider.crawl('https://order.jd.com/center/list.action', method='POST',params = params)
-    print(data)
\ No newline at end of file
+    print(data)
+
+    # 补全订单详情（多商品订单的全部商品行、物流、发票）
+    from service.order_store import OrderStore
+    store = OrderStore()
+    store.upsert_many(data)
+    detail_spider = DetailSpider(store)
+    detail_spider.set_headers(dict(debug_spider.session.headers))
+    detail_spider.enrich(data, limit=200)
\ No newline at end of file
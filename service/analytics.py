@@ -0,0 +1,119 @@
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.category import CATEGORY_KEYWORDS, category_pattern
+
+logger = logging.getLogger(__name__)
+
+# 分析用到的字段
+COLUMNS = ['order_id', 'order_time', 'shop_name', 'product_name', 'quantity', 'amount', 'payment_method', 'status']
+
+# 取值有限的文本列，用 category 类型节省内存并加速分组
+CATEGORICAL_COLUMNS = ['shop_name', 'payment_method', 'status', 'category']
+
+UNCATEGORIZED = '其他'
+
+
+def orders_to_frame(orders: List[Dict[str, Any]]) -> pd.DataFrame:
+    """把订单字典列表转换为带类型的 DataFrame（以 order_id 为索引）"""
+    frame = pd.DataFrame.from_records(orders, columns=COLUMNS)
+    frame = frame.dropna(subset=['order_id']).drop_duplicates('order_id', keep='last')
+
+    frame['order_time'] = pd.to_datetime(frame['order_time'], errors='coerce')
+    frame['amount'] = pd.to_numeric(frame['amount'], errors='coerce').fillna(0.0).astype('float64')
+    frame['quantity'] = pd.to_numeric(frame['quantity'], errors='coerce').fillna(0).astype('int64')
+
+    # 按商品名称关键词归类，命中多个分类时取第一个
+    names = frame['product_name'].fillna('').astype(str)
+    # 与表格筛选一致，不区分大小写（USB、SSD、iPhone 等）
+    conditions = [names.str.contains(category_pattern(category), case=False, regex=True)
+                  for category in CATEGORY_KEYWORDS]
+    frame['category'] = np.select(conditions, list(CATEGORY_KEYWORDS), default=UNCATEGORIZED) \
+        if conditions else UNCATEGORIZED
+
+    for column in CATEGORICAL_COLUMNS:
+        frame[column] = frame[column].fillna('未知').astype('category')
+
+    return frame.set_index('order_id')
+
+
+class SpendingAnalytics:
+    """
+    消费统计
+    订单数据缓存为 DataFrame，按订单库版本缓存统计结果，新订单到来时只增量加载变化的部分
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store: OrderStore 实例
+        """
+        self.store = store
+        self.frame: Optional[pd.DataFrame] = None
+        self._loaded_at = 0.0
+        self._version = None
+        self._summary = None
+
+    def refresh(self) -> bool:
+        """
+        同步订单库的变化
+
+        Returns:
+            数据是否有变化
+        """
+        version = self.store.version()
+        if version == self._version:
+            return False
+
+        if self.frame is None:
+            self.frame = orders_to_frame(self.store.all())
+        else:
+            changed = self.store.updated_since(self._loaded_at)
+            if changed:
+                delta = orders_to_frame(changed)
+                # 先合并再统一 category 类型，避免新出现的取值变成 object
+                merged = pd.concat([self.frame[~self.frame.index.isin(delta.index)], delta])
+                for column in CATEGORICAL_COLUMNS:
+                    merged[column] = merged[column].astype('category')
+                self.frame = merged
+
+        self._loaded_at = version[1]
+        self._version = version
+        self._summary = None
+        logger.debug("消费统计数据已更新: %d 个订单", len(self.frame))
+        return True
+
+    def _group_sum(self, column) -> pd.Series:
+        return (self.frame.groupby(column, observed=True)['amount']
+                .sum().sort_values(ascending=False).round(2))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        消费汇总，数据未变化时直接返回缓存结果
+
+        Returns:
+            {'total': 总金额, 'orders': 订单数, 'by_month': Series, 'by_shop': Series, ...}
+        """
+        self.refresh()
+        if self._summary is not None:
+            return self._summary
+
+        frame = self.frame
+        by_month = (frame.dropna(subset=['order_time'])
+                    .groupby(frame['order_time'].dt.to_period('M'))['amount']
+                    .sum().sort_index(ascending=False).round(2))
+        by_month.index = by_month.index.astype(str)
+
+        self._summary = {
+            'total': round(float(frame['amount'].sum()), 2),
+            'orders': int(len(frame)),
+            'by_month': by_month,
+            'by_shop': self._group_sum('shop_name'),
+            'by_category': self._group_sum('category'),
+            'by_payment': self._group_sum('payment_method'),
+            'by_status': self._group_sum('status'),
+        }
+        return self._summary
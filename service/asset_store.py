@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import os
+from typing import Dict, Optional
+
+from service.storage import DATA_DIR
+from utils.serialize import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class AssetStore:
+    """
+    内容寻址的附件存储
+    文件以内容哈希命名，相同内容（如重复购买的商品图片）只保存一份
+    """
+
+    def __init__(self, root: str = None):
+        """
+        Args:
+            root: 存储根目录，默认 data/assets
+        """
+        self.root = root or os.path.join(DATA_DIR, "assets")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.index_path = os.path.join(self.root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # urls: url -> {hash, ext}；orders: order_id -> {附件类型: hash}
+        self.index = {'urls': {}, 'orders': {}}
+        self._load_index()
+
+    def _load_index(self):
+        """读取索引文件"""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'rb') as f:
+                self.index.update(loads(f.read()))
+        except (OSError, ValueError) as e:
+            logger.error("读取附件索引失败: %s", e)
+
+    def save(self):
+        """写回索引文件（先写临时文件再替换，避免写一半时损坏）"""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(self.index))
+        os.replace(tmp_path, self.index_path)
+
+    def path_of(self, digest: str, ext: str = "") -> str:
+        """内容哈希对应的文件路径，按哈希前两位分目录"""
+        return os.path.join(self.objects_dir, digest[:2], digest + ext)
+
+    def has_url(self, url: str) -> bool:
+        """该URL是否已下载过"""
+        return url in self.index['urls']
+
+    def get_url(self, url: str) -> Optional[str]:
+        """返回URL对应文件的本地路径，未下载返回 None"""
+        entry = self.index['urls'].get(url)
+        if not entry:
+            return None
+        return self.path_of(entry['hash'], entry.get('ext', ''))
+
+    def put(self, url: str, content: bytes, ext: str = "") -> str:
+        """
+        保存附件内容
+
+        Args:
+            url: 来源URL
+            content: 文件内容
+            ext: 文件扩展名（含点号）
+
+        Returns:
+            内容哈希
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path_of(digest, ext)
+
+        # 内容已存在则只记录映射，不重复写盘
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        self.index['urls'][url] = {'hash': digest, 'ext': ext}
+        return digest
+
+    def link(self, order_id: str, kind: str, url: str):
+        """记录订单与附件的对应关系"""
+        entry = self.index['urls'].get(url)
+        if entry:
+            self.index['orders'].setdefault(order_id, {})[kind] = entry['hash']
+
+    def get_order_assets(self, order_id: str) -> Dict[str, str]:
+        """返回订单的附件 {附件类型: 内容哈希}"""
+        return dict(self.index['orders'].get(order_id, {}))
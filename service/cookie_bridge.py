@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import weakref
+from typing import Dict, Tuple
+
+import requests
+
+from service.storage import DATA_DIR, read_cookies
+from utils.serialize import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+CookieKey = Tuple[str, str, str]  # (domain, name, path)
+
+
+class CookieBridge:
+    """
+    内存 cookie 库
+    浏览器登录产生的 cookie 推送到这里，再实时同步到所有已注册的爬虫会话，爬取时不再读取磁盘
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: 持久化文件，默认 data/cookies.json
+        """
+        self.path = path or os.path.join(DATA_DIR, "cookies.json")
+        self._cookies: Dict[CookieKey, str] = {}
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        """首次使用时加载持久化的 cookie；没有时从浏览器 Cookies 数据库读取一次"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    for domain, name, path, value in loads(f.read()):
+                        self._cookies[(domain, name, path)] = value
+                return
+            except (OSError, ValueError) as e:
+                logger.error("读取 cookies 文件失败: %s", e)
+        # 保留数据库中的 host_key 和路径，与浏览器之后推送的 cookie 使用同一个键，避免重复
+        for cookie in read_cookies():
+            self._cookies[(cookie['domain'], cookie['name'], cookie['path'] or '/')] = cookie['value']
+
+    def register(self, session: requests.Session):
+        """注册爬虫会话：写入当前 cookie，之后的变化会自动推送"""
+        with self._lock:
+            self._ensure_loaded()
+            for (domain, name, path), value in self._cookies.items():
+                session.cookies.set(name, value, domain=domain, path=path)
+            self._sessions.add(session)
+
+    def set_cookie(self, domain: str, name: str, value: str, path: str = '/'):
+        """新增或更新 cookie"""
+        with self._lock:
+            self._ensure_loaded()
+            self._cookies[(domain, name, path)] = value
+            for session in list(self._sessions):
+                session.cookies.set(name, value, domain=domain, path=path)
+
+    def remove_cookie(self, domain: str, name: str, path: str = '/'):
+        """删除 cookie"""
+        with self._lock:
+            self._ensure_loaded()
+            self._cookies.pop((domain, name, path), None)
+            for session in list(self._sessions):
+                try:
+                    session.cookies.clear(domain, path, name)
+                except KeyError:
+                    pass
+
+    def get_cookies_dict(self) -> Dict[str, str]:
+        """{name: value}"""
+        with self._lock:
+            self._ensure_loaded()
+            return {name: value for (_, name, _), value in self._cookies.items()}
+
+    def save(self):
+        """持久化到文件"""
+        with self._lock:
+            records = [[domain, name, path, value] for (domain, name, path), value in self._cookies.items()]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(records))
+        os.replace(tmp_path, self.path)
+
+
+# 进程内共享的 cookie 库
+cookie_bridge = CookieBridge()
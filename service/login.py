@@ -2,7 +2,7 @@ import os
 import sys
 from pathlib import Path
 
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QUrl, QTimer
 from PySide6.QtGui import QAction
 from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
 from PySide6.QtWebEngineWidgets import QWebEngineView
@@ -11,6 +11,8 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QWidget
 )
 
+from service.cookie_bridge import cookie_bridge
+
 
 class CustomWebEnginePage(QWebEnginePage):
     def __init__(self, profile, parent=None, main_view=None):
@@ -31,12 +33,48 @@ class CustomWebEnginePage(QWebEnginePage):
 
 
 class BrowserCookies:
-    """封装 cookies 操作，方便其他模块调用"""
+    """封装 cookies 操作，方便其他模块调用
+
+    订阅浏览器 cookie 的增删信号，实时推送到 cookie_bridge（进而同步到所有爬虫会话）
+    """
+
+    # 连续变化合并后再写文件的间隔（毫秒）
+    SAVE_DELAY = 1000
+
+    def __init__(self, profile, bridge=cookie_bridge):
+        self.profile_path = profile.persistentStoragePath()
+        self.bridge = bridge
+
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY)
+        self._save_timer.timeout.connect(self.bridge.save)
+
+        self.cookie_store = profile.cookieStore()
+        self.cookie_store.cookieAdded.connect(self._on_cookie_added)
+        self.cookie_store.cookieRemoved.connect(self._on_cookie_removed)
+        # 触发已有 cookie 的 cookieAdded 信号，完成初始同步
+        self.cookie_store.loadAllCookies()
+
+    @staticmethod
+    def _key(cookie):
+        name = bytes(cookie.name()).decode('utf-8', errors='replace')
+        return cookie.domain(), name, cookie.path() or '/'
+
+    def _on_cookie_added(self, cookie):
+        domain, name, path = self._key(cookie)
+        value = bytes(cookie.value()).decode('utf-8', errors='replace')
+        self.bridge.set_cookie(domain, name, value, path)
+        self._save_timer.start()
 
-    def __init__(self, profile_path):
-        self.profile_path = profile_path
+    def _on_cookie_removed(self, cookie):
+        domain, name, path = self._key(cookie)
+        self.bridge.remove_cookie(domain, name, path)
+        self._save_timer.start()
 
-        self.conn  = None
+    def get_cookies_dict(self):
+        """{name: value}"""
+        return self.bridge.get_cookies_dict()
 
 
 class LoginWindow(QMainWindow):
@@ -50,7 +88,7 @@ class LoginWindow(QMainWindow):
 
 
         # 初始化 cookies 管理器
-        self.cookies_manager = BrowserCookies(self.web_engine_profile.persistentStoragePath())
+        self.cookies_manager = BrowserCookies(self.web_engine_profile)
 
 
     def _init_browser_profile(self):
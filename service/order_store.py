@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable
+
+from crawlers.order import content_hash
+from service.storage import DATA_DIR
+from utils.serialize import dumps_str, loads
+
+
+class OrderStore:
+    """
+    本地订单库（SQLite），按 order_id 合并保存订单
+    每个订单保存内容哈希，重复爬取时内容未变的订单不再写入；状态变化记录在 order_events 中
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Args:
+            db_path: 数据库文件路径，默认 data/orders.db
+        """
+        self.db_path = db_path or os.path.join(DATA_DIR, "orders.db")
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # 爬取时写入可能来自多个线程，连接由锁串行使用
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._init_schema()
+
+    def _init_schema(self):
+        """建表"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS orders (
+                order_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                status TEXT,
+                order_time TEXT,
+                updated_at REAL,
+                enriched_at REAL,
+                content_hash TEXT
+            )
+        """)
+        # 订单状态变化记录（新订单记为从 NULL 变为当前状态）
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS order_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id TEXT NOT NULL,
+                old_status TEXT,
+                new_status TEXT,
+                changed_at REAL NOT NULL
+            )
+        """)
+        self._migrate()
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_time ON orders (order_time)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_updated ON orders (updated_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_time ON order_events (changed_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_order ON order_events (order_id)")
+        self.conn.commit()
+
+    def _migrate(self):
+        """旧版本的订单库没有 content_hash 列，补上并为已有订单计算哈希"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(orders)")}
+        if 'content_hash' in columns:
+            return
+        self.conn.execute("ALTER TABLE orders ADD COLUMN content_hash TEXT")
+        rows = self.conn.execute("SELECT order_id, data FROM orders").fetchall()
+        self.conn.executemany("UPDATE orders SET content_hash = ? WHERE order_id = ?",
+                              [(content_hash(loads(data)), order_id) for order_id, data in rows])
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """读取单个订单"""
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM orders WHERE order_id = ?", (order_id,)).fetchone()
+            return loads(row[0]) if row else None
+
+    def get_meta(self, order_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量读取订单的状态和补全时间
+
+        Returns:
+            {order_id: {'status': ..., 'enriched_at': ...}}
+        """
+        with self._lock:
+            order_ids = list(order_ids)
+            meta = {}
+            # SQLite 单条语句的参数个数有限，分批查询
+            for i in range(0, len(order_ids), 500):
+                chunk = order_ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT order_id, status, enriched_at FROM orders WHERE order_id IN ({placeholders})", chunk)
+                for order_id, status, enriched_at in rows:
+                    meta[order_id] = {'status': status, 'enriched_at': enriched_at}
+            return meta
+
+    def all(self) -> List[Dict[str, Any]]:
+        """按下单时间倒序读取所有订单"""
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM orders ORDER BY order_time DESC")
+            return [loads(row[0]) for row in rows]
+
+    def recent(self, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        按下单时间倒序分页读取订单（走 order_time 索引），用于先展示第一屏再分批加载
+
+        Args:
+            limit: 本页条数
+            offset: 跳过的条数
+        """
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM orders ORDER BY order_time DESC LIMIT ? OFFSET ?",
+                                     (limit, offset))
+            return [loads(row[0]) for row in rows]
+
+    def version(self) -> tuple:
+        """数据版本：(订单数, 最近更新时间)，任何写入都会改变它"""
+        with self._lock:
+            count, updated_at = self.conn.execute("SELECT COUNT(*), MAX(updated_at) FROM orders").fetchone()
+            return count, updated_at or 0.0
+
+    def updated_since(self, timestamp: float) -> List[Dict[str, Any]]:
+        """读取 timestamp 之后内容有变化的订单（内容未变的重复写入不会更新时间）"""
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM orders WHERE updated_at > ?", (timestamp,))
+            return [loads(row[0]) for row in rows]
+
+    def changed_ids_since(self, timestamp: float) -> List[str]:
+        """timestamp 之后内容有变化的订单号"""
+        with self._lock:
+            rows = self.conn.execute("SELECT order_id FROM orders WHERE updated_at > ?", (timestamp,))
+            return [row[0] for row in rows]
+
+    def status_events(self, since: float = 0.0, order_id: str = None) -> List[Dict[str, Any]]:
+        """
+        读取订单状态变化记录
+
+        Args:
+            since: 只返回该时间之后的记录
+            order_id: 只返回该订单的记录
+
+        Returns:
+            按时间顺序的 [{'order_id', 'old_status', 'new_status', 'changed_at'}]
+        """
+        sql = "SELECT order_id, old_status, new_status, changed_at FROM order_events WHERE changed_at > ?"
+        params = [since]
+        if order_id is not None:
+            sql += " AND order_id = ?"
+            params.append(order_id)
+        with self._lock:
+            rows = self.conn.execute(sql + " ORDER BY id", params)
+            return [{'order_id': r[0], 'old_status': r[1], 'new_status': r[2], 'changed_at': r[3]}
+                    for r in rows]
+
+    def _load_many(self, order_ids: List[str]) -> Dict[str, tuple]:
+        """批量读取 {order_id: (订单字典, 内容哈希)}，调用时必须持有锁"""
+        stored = {}
+        for i in range(0, len(order_ids), 500):
+            chunk = order_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT order_id, data, content_hash FROM orders WHERE order_id IN ({placeholders})", chunk)
+            for order_id, data, digest in rows:
+                stored[order_id] = (loads(data), digest)
+        return stored
+
+    def _record_status(self, order_id: str, old_status: Optional[str], new_status: Optional[str], now: float):
+        if old_status != new_status:
+            self.conn.execute(
+                "INSERT INTO order_events (order_id, old_status, new_status, changed_at) VALUES (?, ?, ?, ?)",
+                (order_id, old_status, new_status, now))
+
+    def upsert_many(self, orders: List[Dict[str, Any]]) -> int:
+        """
+        批量写入订单，已存在的订单与新字段合并（保留详情页补全的字段）
+        合并后内容哈希不变的订单跳过写入，状态变化时记录到 order_events
+
+        Returns:
+            内容有变化（新增或更新）的订单数
+        """
+        # 同一批中重复的订单先合并，后出现的字段覆盖先出现的
+        incoming: Dict[str, Dict[str, Any]] = {}
+        for order in orders:
+            order_id = order.get('order_id')
+            if not order_id:
+                continue
+            if hasattr(order, 'to_dict'):
+                order = order.to_dict()
+            incoming.setdefault(order_id, {}).update(order)
+
+        with self._lock:
+            now = time.time()
+            existing = self._load_many(list(incoming))
+            count = 0
+            with self.conn:
+                for order_id, order in incoming.items():
+                    stored, old_hash = existing.get(order_id, (None, None))
+                    merged = dict(stored or {}, **order)
+                    digest = content_hash(merged)
+                    if digest == old_hash:
+                        continue
+                    self.conn.execute("""
+                        INSERT INTO orders (order_id, data, status, order_time, updated_at, content_hash)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(order_id) DO UPDATE SET
+                            data = excluded.data,
+                            status = excluded.status,
+                            order_time = excluded.order_time,
+                            updated_at = excluded.updated_at,
+                            content_hash = excluded.content_hash
+                    """, (order_id, dumps_str(merged),
+                          merged.get('status'), merged.get('order_time'), now, digest))
+                    self._record_status(order_id, stored.get('status') if stored else None,
+                                        merged.get('status'), now)
+                    count += 1
+            return count
+
+    def merge_detail(self, order_id: str, detail: Dict[str, Any]):
+        """把详情页解析结果合并进订单，并记录补全时间；内容未变时只更新补全时间"""
+        with self._lock:
+            stored, old_hash = self._load_many([order_id]).get(order_id, (None, None))
+            merged = dict(stored or {'order_id': order_id}, **detail)
+            digest = content_hash(merged)
+            now = time.time()
+            with self.conn:
+                if digest == old_hash:
+                    self.conn.execute("UPDATE orders SET enriched_at = ? WHERE order_id = ?", (now, order_id))
+                    return
+                self.conn.execute("""
+                    INSERT INTO orders (order_id, data, status, order_time, updated_at, enriched_at, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(order_id) DO UPDATE SET
+                        data = excluded.data,
+                        status = excluded.status,
+                        updated_at = excluded.updated_at,
+                        enriched_at = excluded.enriched_at,
+                        content_hash = excluded.content_hash
+                """, (order_id, dumps_str(merged),
+                      merged.get('status'), merged.get('order_time'), now, now, digest))
+                self._record_status(order_id, stored.get('status') if stored else None,
+                                    merged.get('status'), now)
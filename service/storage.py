@@ -1,12 +1,18 @@
+import logging
 import os
 import sqlite3
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 本地数据目录（订单、附件等）
+DATA_DIR = os.path.join(BASE_DIR, "data")
 
-def get_cookies_dict()-> dict:
-    """从 SQLite 数据库读取 cookies"""
-    BASE_DIR = Path(__file__).resolve().parent.parent
 
+def read_cookies() -> list:
+    """从浏览器 Cookies 数据库读取 cookies，保留域名、路径等属性"""
     cookies_db_path = os.path.join(BASE_DIR,"profile","Cookies")
 
     cookies = []
@@ -15,17 +21,17 @@ def get_cookies_dict()-> dict:
     try:
         # 检查数据库文件是否存在
         if not os.path.exists(cookies_db_path):
-            print(f"Cookies 数据库文件不存在: {cookies_db_path}")
-            return cookies
-        print("路径：", cookies_db_path)
+            logger.warning("Cookies 数据库文件不存在: %s", cookies_db_path)
+            return []
+        logger.debug("路径：%s", cookies_db_path)
         conn = sqlite3.connect(cookies_db_path)
         cursor = conn.cursor()
 
         # 检查 cookies 表是否存在
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cookies'")
         if not cursor.fetchone():
-            print("cookies 表不存在")
-            return cookies
+            logger.warning("cookies 表不存在")
+            return []
 
         cursor.execute("""
             SELECT host_key, name, value, path, expires_utc, is_secure, is_httponly 
@@ -43,20 +49,21 @@ def get_cookies_dict()-> dict:
                 'httponly': bool(row[6])
             })
 
-        print(f"成功读取 {len(cookies)} 个 cookies")
+        logger.info("成功读取 %d 个 cookies", len(cookies))
 
     except sqlite3.Error as e:
-        print(f"读取 cookies 数据库错误: {e}")
+        logger.error("读取 cookies 数据库错误: %s", e)
     except Exception as e:
-        print(f"读取 cookies 失败: {e}")
+        logger.error("读取 cookies 失败: %s", e)
     finally:
         # 只有在连接成功建立时才关闭
         if conn is not None:
             conn.close()
             conn = None
 
-    return {c['name']: c['value'] for c in cookies}
+    return cookies
 
 
-
-cookie = get_cookies_dict()
\ No newline at end of file
+def get_cookies_dict()-> dict:
+    """从 SQLite 数据库读取 cookies"""
+    return {c['name']: c['value'] for c in read_cookies()}
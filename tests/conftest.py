@@ -0,0 +1,10 @@
+import pytest
+
+from tests.helpers import EchoServer
+
+
+@pytest.fixture
+def echo_server():
+    server = EchoServer()
+    yield server
+    server.stop()
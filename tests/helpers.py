@@ -0,0 +1,51 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+from crawlers.base_spider import SimpleSpider
+
+
+class EchoServer:
+    """
+    测试用的本地服务：按路径延迟后返回请求的 Cookie 头
+    /slow/... 延迟 slow_latency 秒，其余路径延迟 latency 秒
+    """
+
+    def __init__(self, latency: float = 0.3, slow_latency: float = 0.3):
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                slow = urlparse(self.path).path.startswith('/slow')
+                time.sleep(server.slow_latency if slow else server.latency)
+                body = (self.headers.get('Cookie') or '').encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path: str = '/', host: str = '127.0.0.1') -> str:
+        return f"http://{host}:{self.httpd.server_port}{path}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class EchoSpider(SimpleSpider):
+    def parse(self, response):
+        return [{'body': response.text}]
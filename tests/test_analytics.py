@@ -0,0 +1,16 @@
+import re
+
+from service.analytics import orders_to_frame, UNCATEGORIZED
+from utils.category import CATEGORY_KEYWORDS, category_pattern
+
+
+def test_category_matches_table_filter_case_insensitively():
+    names = ['usb 扩展坞', 'Samsung ssd 1TB', 'iphone 15 保护壳', '大米 5kg']
+    frame = orders_to_frame([{'order_id': str(i), 'product_name': name} for i, name in enumerate(names)])
+
+    for name, category in zip(names, frame['category']):
+        # 表格筛选（StyledTableWidget._match_item）使用 re.IGNORECASE
+        expected = next((c for c in CATEGORY_KEYWORDS
+                         if re.search(category_pattern(c), name, re.IGNORECASE)), UNCATEGORIZED)
+        assert category == expected
+    assert UNCATEGORIZED not in list(frame['category'][:3])
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from crawlers.concurrency import AdaptiveConcurrency
+from crawlers.scheduler import DeadlineExceeded, RequestCancelled
+from tests.helpers import EchoSpider
+
+
+class CancellingSpider(EchoSpider):
+    """解析第一页后请求停止"""
+
+    def parse(self, response):
+        self.cancel_event.set()
+        return super().parse(response)
+
+
+def test_crawl_stops_after_cancel(echo_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    spider = CancellingSpider(cancel_event=threading.Event(), scheduler=None, single_flight=None)
+
+    data = spider.crawl([echo_server.url(f'/{i}') for i in range(3)])
+
+    assert len(data) == 1
+    assert echo_server.request_count == 1
+    assert spider.request(echo_server.url('/late')) is None
+    assert echo_server.request_count == 1
+
+
+def test_host_window_wait_is_bounded():
+    concurrency = AdaptiveConcurrency(max_window=1, initial_window=1)
+    concurrency.acquire('host')
+
+    with pytest.raises(DeadlineExceeded):
+        concurrency.acquire('host', deadline=time.monotonic() + 0.05)
+
+    cancel_event = threading.Event()
+    threading.Timer(0.05, cancel_event.set).start()
+    with pytest.raises(RequestCancelled):
+        concurrency.acquire('host', cancel_event=cancel_event)
+
+    concurrency.release('host')
+    with concurrency.slot('host', deadline=time.monotonic() + 1):
+        assert concurrency.snapshot()['host']['in_flight'] == 1
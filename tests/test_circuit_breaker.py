@@ -0,0 +1,26 @@
+from crawlers.circuit_breaker import CircuitBreaker, HALF_OPEN
+from crawlers.proxy_pool import ProxyPool
+from tests.helpers import EchoSpider
+
+
+class BrokenPool(ProxyPool):
+    def acquire(self, key=None):
+        raise RuntimeError('no proxy')
+
+
+def _half_open_breaker(host):
+    breaker = CircuitBreaker(min_requests=1, cooldown=0)
+    assert breaker.allow(host)
+    breaker.record(host, False)
+    return breaker
+
+
+def test_probe_is_returned_when_attempt_fails_before_sending(echo_server):
+    breaker = _half_open_breaker('127.0.0.1')
+    # 取代理时出错，请求没有发出
+    spider = EchoSpider(breaker=breaker, proxy_pool=BrokenPool(['http://127.0.0.1:9']), scheduler=None, single_flight=None)
+
+    assert spider.request(echo_server.url('/list')) is None
+
+    assert breaker.state('127.0.0.1') == HALF_OPEN
+    assert breaker.allow('127.0.0.1')
@@ -0,0 +1,65 @@
+import time
+
+from crawlers.engine import CrawlEngine
+from crawlers.sink import CallbackSink
+from tests.helpers import EchoServer, EchoSpider
+
+
+def test_slow_host_does_not_block_other_hosts():
+    server = EchoServer(latency=0.5, slow_latency=0.5)
+    try:
+        engine = CrawlEngine(capacity=4, max_per_site=1)
+        slow_urls = [server.url(f'/slow/{i}') for i in range(8)]
+        engine.add(EchoSpider, run=lambda spider: [url for url, _ in spider.request_many(slow_urls)],
+                   name='slow', max_workers=8)
+
+        elapsed = {}
+
+        def fetch_other_host(spider):
+            # 等慢主机的请求占满窗口后再发出
+            time.sleep(0.2)
+            start = time.perf_counter()
+            response = spider.request(server.url('/fast', host='localhost'))
+            elapsed['fast'] = time.perf_counter() - start
+            return [response.text]
+
+        engine.add(EchoSpider, run=fetch_other_host, name='fast')
+        engine.run()
+    finally:
+        server.stop()
+
+    assert not engine.errors()
+    # 只等自己的 0.5 秒，不排在慢主机的请求后面
+    assert elapsed['fast'] < 1.5
+
+
+def test_accounts_in_one_engine_do_not_share_responses(echo_server):
+    engine = CrawlEngine(capacity=4)
+    url = echo_server.url('/list')
+    for account in 'AB':
+        spider = engine.add(EchoSpider, run=lambda s: [s.request(url).text], name=account)
+        spider.session.cookies.clear()
+        spider.set_cookies({'pt_key': f'ACCOUNT_{account}'})
+
+    results = engine.run()
+
+    assert results == {'A': ['pt_key=ACCOUNT_A'], 'B': ['pt_key=ACCOUNT_B']}
+    assert engine.stats()['totals']['coalesced_requests'] == 0
+
+
+def test_sink_jobs_report_summary(echo_server, tmp_path, monkeypatch):
+    # 不用 sink 的 crawl 会把数据保存到当前目录
+    monkeypatch.chdir(tmp_path)
+    sink = CallbackSink(lambda batch: None)
+    engine = CrawlEngine()
+    engine.add(EchoSpider, run=lambda s: s.crawl([echo_server.url('/a'), echo_server.url('/b')], sink=sink),
+               name='sink')
+    engine.add(EchoSpider, urls=[echo_server.url('/c')], name='list')
+
+    results = engine.run()
+
+    assert results['sink'] == {'items': 2, 'written': 2, 'batches': 1}
+    assert [item['body'] for item in engine.items()] == ['']
+    stats = engine.stats()
+    assert stats['spiders']['sink']['items'] == 2
+    assert stats['totals']['items'] == 3
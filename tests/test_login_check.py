@@ -0,0 +1,32 @@
+import pytest
+
+from crawlers.base_spider import SessionExpiredError
+from tests.helpers import EchoSpider
+
+
+class LoginSpider(EchoSpider):
+    login_markers = (b'LOGIN_PAGE',)
+
+
+def _spider(cookie):
+    spider = LoginSpider(scheduler=None, single_flight=None)
+    spider.session.cookies.clear()
+    spider.set_cookies({'page': cookie})
+    return spider
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_login_page_raises(echo_server, stream):
+    spider = _spider('LOGIN_PAGE')
+
+    with pytest.raises(SessionExpiredError):
+        spider.request(echo_server.url('/list'), stream=stream)
+
+
+def test_streamed_check_keeps_body(echo_server):
+    spider = _spider('x' * 64)
+    spider.login_marker_bytes = 16
+
+    response = spider.request(echo_server.url('/list'), stream=True)
+
+    assert b''.join(response.iter_content(10)) == b'page=' + b'x' * 64
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from crawlers.order import parse_time, to_cents
+
+
+@pytest.mark.parametrize('amount, cents', [
+    ('12.5', 1250),
+    (' 8.00 ', 800),
+    (19.99, 1999),
+    (0.1, 10),
+    (3, 300),
+    ('0', 0),
+    ('-3.2', -320),
+    (None, None),
+    ('', None),
+    ('abc', None),
+    ('¥5', None),
+    ('NaN', None),
+    ('Infinity', None),
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+
+def test_parse_time_uses_local_time():
+    expected = int(time.mktime((2025, 10, 20, 10, 30, 0, 0, 0, -1)))
+
+    assert parse_time('2025-10-20 10:30:00') == expected
+    assert parse_time(' 2025-10-20 10:30:00 ') == expected
+
+
+@pytest.mark.parametrize('text', [None, '', '2025-10-20', '2025-13-01 00:00:00', '2025-02-29 00:00:00'])
+def test_parse_time_invalid(text):
+    assert parse_time(text) is None
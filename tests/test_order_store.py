@@ -0,0 +1,28 @@
+from service.order_store import OrderStore
+
+
+def _store(tmp_path):
+    return OrderStore(str(tmp_path / 'orders.db'))
+
+
+def test_unchanged_orders_are_not_rewritten(tmp_path):
+    store = _store(tmp_path)
+    orders = [{'order_id': str(i), 'status': '已完成', 'amount': '9.90'} for i in range(3)]
+
+    assert store.upsert_many(orders) == 3
+    version = store.version()
+    assert store.upsert_many([dict(order) for order in orders]) == 0
+    assert store.version() == version
+    store.close()
+
+
+def test_status_change_records_one_event(tmp_path):
+    store = _store(tmp_path)
+    store.upsert_many([{'order_id': '1', 'status': '等待收货'}])
+
+    assert store.upsert_many([{'order_id': '1', 'status': '已完成'}]) == 1
+    assert store.upsert_many([{'order_id': '1', 'status': '已完成'}]) == 0
+
+    events = store.status_events(order_id='1')
+    assert [(e['old_status'], e['new_status']) for e in events] == [(None, '等待收货'), ('等待收货', '已完成')]
+    store.close()
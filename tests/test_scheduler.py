@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from crawlers.scheduler import (DeadlineExceeded, RequestScheduler,
+                                PRIORITY_ASSET, PRIORITY_DETAIL, PRIORITY_LIST)
+
+
+def _wait_queued(scheduler, count):
+    while sum(scheduler.snapshot()['queued'].values()) < count:
+        time.sleep(0.01)
+
+
+def test_free_slot_goes_to_highest_priority():
+    scheduler = RequestScheduler(capacity=1, shares={})
+    order = []
+
+    def run(priority):
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    scheduler.acquire(PRIORITY_LIST)
+    threads = []
+    for count, priority in enumerate([PRIORITY_ASSET, PRIORITY_DETAIL, PRIORITY_LIST], 1):
+        thread = threading.Thread(target=run, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        # 按提交顺序逐个入队，排在前面的是低优先级请求
+        _wait_queued(scheduler, count)
+    scheduler.release(PRIORITY_LIST)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [PRIORITY_LIST, PRIORITY_DETAIL, PRIORITY_ASSET]
+
+
+def test_deadline_exceeded_does_not_leak_slot():
+    scheduler = RequestScheduler(capacity=1, shares={})
+    scheduler.acquire(PRIORITY_LIST)
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(PRIORITY_DETAIL, deadline=time.monotonic() + 0.05)
+    assert scheduler.snapshot()['expired'] == 1
+
+    scheduler.release(PRIORITY_LIST)
+    with scheduler.slot(PRIORITY_DETAIL, deadline=time.monotonic() + 1):
+        assert scheduler.snapshot()['in_use'] == {PRIORITY_LIST: 0, PRIORITY_DETAIL: 1}
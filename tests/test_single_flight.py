@@ -0,0 +1,45 @@
+import threading
+
+from crawlers.fingerprint import SingleFlight
+from tests.helpers import EchoSpider
+
+
+def _fetch_concurrently(spiders, url):
+    bodies = {}
+
+    def fetch(name, spider):
+        bodies[name] = spider.request(url).text
+
+    threads = [threading.Thread(target=fetch, args=item) for item in spiders.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return bodies
+
+
+def test_same_session_requests_are_coalesced(echo_server):
+    flight = SingleFlight()
+    spiders = {name: EchoSpider(name=name, single_flight=flight, scheduler=None) for name in 'AB'}
+    for spider in spiders.values():
+        spider.session.cookies.clear()
+        spider.set_cookies({'pt_key': 'ACCOUNT_A'})
+
+    bodies = _fetch_concurrently(spiders, echo_server.url('/list'))
+
+    assert bodies == {'A': 'pt_key=ACCOUNT_A', 'B': 'pt_key=ACCOUNT_A'}
+    assert echo_server.request_count == 1
+
+
+def test_different_sessions_are_not_coalesced(echo_server):
+    flight = SingleFlight()
+    spiders = {name: EchoSpider(name=name, single_flight=flight, scheduler=None) for name in 'AB'}
+    for name, spider in spiders.items():
+        spider.session.cookies.clear()
+        spider.set_cookies({'pt_key': f'ACCOUNT_{name}'})
+
+    bodies = _fetch_concurrently(spiders, echo_server.url('/list'))
+
+    assert bodies == {'A': 'pt_key=ACCOUNT_A', 'B': 'pt_key=ACCOUNT_B'}
+    assert echo_server.request_count == 2
+    assert all(spider.stats['coalesced_requests'] == 0 for spider in spiders.values())
@@ -0,0 +1,35 @@
+from crawlers.sink import CallbackSink, DedupSink, JsonLinesSink
+from utils.serialize import loads
+
+
+def test_sink_writes_full_batches_and_flushes_on_exit():
+    batches = []
+
+    with CallbackSink(batches.append, batch_size=3, max_age=60) as sink:
+        for i in range(7):
+            sink.add(i)
+        assert batches == [[0, 1, 2], [3, 4, 5]]
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert sink.summary() == {'items': 7, 'written': 7, 'batches': 3}
+
+
+def test_sink_flushes_stale_buffer():
+    batches = []
+    sink = CallbackSink(batches.append, batch_size=100, max_age=0)
+
+    sink.add(1)
+    sink.add(2)
+
+    assert batches == [[1], [2]]
+
+
+def test_dedup_jsonl_sink(tmp_path):
+    path = tmp_path / 'orders.jsonl'
+    orders = [{'order_id': '1'}, {'order_id': '2'}, {'order_id': '1'}]
+
+    with DedupSink(JsonLinesSink(str(path), batch_size=2)) as sink:
+        sink.add_many(orders)
+
+    assert [loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == orders[:2]
+    assert sink.summary() == {'items': 2, 'written': 2, 'batches': 1, 'duplicates': 1}
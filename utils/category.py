@@ -0,0 +1,72 @@
+# category.py
+
+"""商品分类关键词，用于表格筛选和消费统计"""
+
+CATEGORY_KEYWORDS = {
+    '电脑配件': [
+        r'电脑|计算机', r'笔记本|台式机', r'CPU|处理器', r'显卡|GPU',
+        r'内存|RAM', r'硬盘|固态|SSD|HDD', r'主板|主板芯片', r'电源|电源供应器',
+        r'机箱|电脑机箱', r'散热器|风扇|水冷', r'显示器|液晶屏', r'键鼠|键盘|鼠标',
+        r'音响|耳机|音箱', r'网卡|路由器|交换机', r'摄像头|麦克风', r'USB|接口|扩展',
+        r'光驱|刻录机'
+    ],
+    '手机数码': [
+        r'手机|智能手机', r'iPhone|安卓', r'平板|iPad', r'智能手表|手环',
+        r'耳机|耳麦|蓝牙耳机', r'充电宝|移动电源', r'数据线|充电器', r'手机壳|保护套',
+        r'贴膜|屏幕保护膜', r'相机|摄像机|单反', r'镜头|摄影器材', r'自拍杆|三脚架',
+        r'存储卡|SD卡|TF卡', r'读卡器|转接头', r'智能家居|智能设备'
+    ],
+    '家用电器': [
+        r'电视|电视机|液晶电视', r'冰箱|冷藏柜', r'洗衣机|烘干机', r'空调|空调器',
+        r'热水器|电热水器', r'微波炉|烤箱|电磁炉', r'电饭煲|电压力锅', r'吸尘器|扫地机',
+        r'电风扇|空气净化器', r'饮水机|净水器', r'榨汁机|料理机', r'电熨斗|挂烫机',
+        r'剃须刀|电动牙刷', r'电吹风|美发器', r'加湿器|除湿机'
+    ],
+    '服装鞋帽': [
+        r'衬衫|T恤|毛衣', r'外套|夹克|风衣', r'裤子|长裤|短裤', r'裙子|连衣裙',
+        r'内衣|内裤|文胸', r'袜子|丝袜', r'运动服|休闲服', r'西装|正装',
+        r'羽绒服|棉服', r'泳装|泳衣', r'鞋子|运动鞋', r'皮鞋|凉鞋|拖鞋',
+        r'帽子|鸭舌帽', r'围巾|手套', r'皮带|腰带'
+    ],
+    '食品饮料': [
+        r'零食|小吃|饼干', r'巧克力|糖果', r'坚果|炒货', r'饮料|果汁|矿泉水',
+        r'咖啡|茶叶', r'牛奶|酸奶', r'方便面|速食', r'米面|粮油',
+        r'调味品|酱油|醋', r'生鲜|水果|蔬菜', r'肉类|海鲜', r'面包|糕点',
+        r'酒类|啤酒|白酒', r'保健品|营养品', r'婴儿食品|奶粉'
+    ],
+    '美妆个护': [
+        r'化妆品|彩妆', r'护肤品|面膜', r'洗面奶|洁面乳', r'香水|香氛',
+        r'口红|唇膏', r'眼影|眉笔', r'粉底|BB霜', r'洗发水|护发素',
+        r'沐浴露|身体乳', r'牙膏|牙刷', r'剃须|脱毛', r'防晒|隔离',
+        r'美容仪|按摩器', r'化妆棉|棉签', r'精油|香薰'
+    ],
+    '图书文具': [
+        r'图书|书籍', r'小说|文学', r'教材|教辅', r'儿童图书|绘本',
+        r'杂志|期刊', r'笔记本|记事本', r'笔|钢笔|圆珠笔', r'文具盒|笔袋',
+        r'橡皮|尺子', r'书包|文具包', r'文件袋|文件夹', r'胶水|胶带',
+        r'订书机|打孔机', r'计算器|办公用品', r'画材|美术用品'
+    ],
+    '运动户外': [
+        r'运动鞋|跑鞋', r'运动服|健身服', r'篮球|足球|排球', r'球拍|网球拍',
+        r'健身器材|哑铃', r'瑜伽垫|瑜伽服', r'自行车|骑行', r'帐篷|睡袋',
+        r'登山包|户外装备', r'钓鱼|渔具', r'游泳|泳镜', r'滑雪|滑板',
+        r'轮滑|溜冰鞋', r'护具|运动保护', r'户外服装|冲锋衣'
+    ],
+    '家居日用': [
+        r'家具|沙发|椅子', r'床上用品|床单', r'窗帘|布艺', r'厨具|锅具',
+        r'餐具|碗筷', r'清洁用品|洗衣液', r'收纳|整理箱', r'装饰品|摆件',
+        r'灯具|台灯', r'地毯|地垫', r'钟表|闹钟', r'镜子|梳妆台',
+        r'毛巾|浴巾', r'雨伞|雨具', r'家居服|拖鞋'
+    ],
+    '母婴玩具': [
+        r'婴儿服装|童装', r'尿不湿|纸尿裤', r'奶粉|奶瓶', r'婴儿车|婴儿床',
+        r'玩具|积木', r'娃娃|玩偶', r'模型|拼装', r'电动玩具|遥控',
+        r'益智玩具|早教', r'滑板车|自行车', r'婴儿食品|辅食', r'孕产妇用品',
+        r'儿童座椅|安全', r'洗护用品|婴儿', r'书包|文具'
+    ],
+}
+
+
+def category_pattern(category: str) -> str:
+    """分类对应的正则表达式，未知分类返回空字符串"""
+    return '|'.join(CATEGORY_KEYWORDS.get(category, []))
@@ -0,0 +1,206 @@
+import csv
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Sequence, Callable, Optional
+
+from openpyxl import Workbook
+
+from utils.serialize import dumps
+
+logger = logging.getLogger(__name__)
+
+# 每写多少行检查一次取消并上报进度
+CHUNK_SIZE = 2000
+
+# 文件写缓冲大小
+BUFFER_SIZE = 1024 * 1024
+
+
+class ExportCancelled(Exception):
+    """导出被用户取消"""
+
+
+def export_csv(filename: str,
+               headers: Sequence[str],
+               rows: Sequence[Sequence[Any]],
+               progress_callback: Callable[[int], None] = None,
+               cancel_event: Optional[threading.Event] = None) -> int:
+    """
+    流式导出 CSV，按 RFC 4180 处理引号、逗号和换行
+
+    Args:
+        filename: 导出文件名
+        headers: 表头
+        rows: 数据行
+        progress_callback: 进度回调，参数为 0-100
+        cancel_event: 置位后中止导出并删除未完成的文件
+
+    Returns:
+        导出的行数
+    """
+    total = len(rows)
+    tmp_path = filename + ".part"
+    try:
+        # utf-8-sig 带 BOM，Excel 直接打开不会乱码
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='', buffering=BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            if headers:
+                writer.writerow(headers)
+            for start in range(0, total, CHUNK_SIZE):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                writer.writerows(rows[start:start + CHUNK_SIZE])
+                if progress_callback:
+                    progress_callback(min(100, (start + CHUNK_SIZE) * 100 // total))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress_callback:
+        progress_callback(100)
+    logger.info("成功导出 %d 行数据到 %s", total, filename)
+    return total
+
+
+def export_jsonl(filename: str,
+                 fields: Sequence[str],
+                 rows: Sequence[Sequence[Any]],
+                 progress_callback: Callable[[int], None] = None,
+                 cancel_event: Optional[threading.Event] = None) -> int:
+    """
+    导出 JSON Lines，每行一个以字段名为键的对象
+
+    Args:
+        filename: 导出文件名
+        fields: 每列对应的字段名
+        rows: 数据行，列顺序与 fields 一致
+        progress_callback: 进度回调，参数为 0-100
+        cancel_event: 置位后中止导出并删除未完成的文件
+
+    Returns:
+        导出的行数
+    """
+    total = len(rows)
+    fields = list(fields)
+    tmp_path = filename + ".part"
+    try:
+        with open(tmp_path, 'wb', buffering=BUFFER_SIZE) as f:
+            for start in range(0, total, CHUNK_SIZE):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                f.write(b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in rows[start:start + CHUNK_SIZE]))
+                if progress_callback:
+                    progress_callback(min(100, (start + CHUNK_SIZE) * 100 // total))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress_callback:
+        progress_callback(100)
+    logger.info("成功导出 %d 行数据到 %s", total, filename)
+    return total
+
+
+# 按字段名决定 Excel 单元格类型
+NUMBER_FIELDS = {'amount', 'price'}
+INTEGER_FIELDS = {'quantity'}
+DATETIME_FIELDS = {'order_time'}
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Excel 工作表名不允许的字符
+_INVALID_SHEET_CHARS = str.maketrans({c: "_" for c in '[]:*?/\\'})
+
+
+def _typed_value(field: str, value: Any) -> Any:
+    """把单元格值转换为 Excel 原生类型，无法转换时保留原值"""
+    if value is None or value == "":
+        return None
+    try:
+        if field in NUMBER_FIELDS:
+            return float(value)
+        if field in INTEGER_FIELDS:
+            return int(value)
+        if field in DATETIME_FIELDS and isinstance(value, str):
+            return datetime.strptime(value.strip(), DATETIME_FORMAT)
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+def _sheet_key(sheet_by: Optional[str], record: dict) -> str:
+    """计算一行数据所属的工作表名"""
+    if not sheet_by:
+        return "订单"
+    if sheet_by == 'month':
+        order_time = record.get('order_time')
+        if isinstance(order_time, datetime):
+            return order_time.strftime("%Y-%m")
+        return "未知月份"
+    return str(record.get(sheet_by) or "未知")
+
+
+def export_xlsx(filename: str,
+                fields: Sequence[str],
+                headers: Sequence[str],
+                rows: Sequence[Sequence[Any]],
+                sheet_by: Optional[str] = None,
+                progress_callback: Callable[[int], None] = None,
+                cancel_event: Optional[threading.Event] = None) -> int:
+    """
+    使用 openpyxl 只写模式流式导出 Excel，内存占用与行数无关
+
+    Args:
+        filename: 导出文件名
+        fields: 每列对应的字段名，用于决定单元格类型
+        headers: 表头
+        rows: 数据行，列顺序与 fields 一致
+        sheet_by: 分表方式，None 不分表，'month' 按下单月份，其他值按该字段分表（如账号）
+        progress_callback: 进度回调，参数为 0-100
+        cancel_event: 置位后中止导出并删除未完成的文件
+
+    Returns:
+        导出的行数
+    """
+    workbook = Workbook(write_only=True)
+    sheets = {}
+    total = len(rows)
+    fields = list(fields)
+
+    for index, row in enumerate(rows):
+        if index % CHUNK_SIZE == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            if progress_callback and total:
+                progress_callback(index * 100 // total)
+
+        record = {field: _typed_value(field, value) for field, value in zip(fields, row)}
+        title = _sheet_key(sheet_by, record).translate(_INVALID_SHEET_CHARS)[:31]
+        sheet = sheets.get(title)
+        if sheet is None:
+            sheet = workbook.create_sheet(title)
+            sheet.append(list(headers))
+            sheets[title] = sheet
+        sheet.append([record.get(field) for field in fields])
+
+    if not sheets:
+        workbook.create_sheet("订单").append(list(headers))
+
+    tmp_path = filename + ".part"
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress_callback:
+        progress_callback(100)
+    logger.info("成功导出 %d 行数据到 %s（%d 个工作表）", total, filename, len(sheets))
+    return total
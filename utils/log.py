@@ -0,0 +1,93 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from typing import List, Optional
+
+from service.storage import DATA_DIR
+from utils.serialize import dumps_str
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return dumps_str(entry)
+
+
+def setup_logging(level: int = logging.INFO,
+                  log_dir: str = None,
+                  console: bool = True,
+                  extra_handlers: List[logging.Handler] = None) -> logging.handlers.QueueListener:
+    """
+    初始化日志：调用方只把日志放进队列，由后台线程写文件/控制台/界面
+
+    Args:
+        level: 日志级别
+        log_dir: 日志目录，默认 data/logs
+        console: 是否同时输出到控制台
+        extra_handlers: 额外的处理器（如界面日志面板）
+
+    Returns:
+        后台队列监听器
+    """
+    global _listener
+    if _listener is not None:
+        atexit.unregister(_listener.stop)
+        _listener.stop()
+
+    log_dir = log_dir or os.path.join(DATA_DIR, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, "app.log"), maxBytes=5 * 1024 * 1024, backupCount=5, encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(console_handler)
+
+    handlers.extend(extra_handlers or [])
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def add_handler(handler: logging.Handler):
+    """
+    日志初始化后追加处理器，用于创建较晚的处理器（如主窗口的日志面板）
+
+    Args:
+        handler: 日志处理器
+    """
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    # 后台线程遍历的是 handlers 元组，整体替换即可
+    _listener.handlers = _listener.handlers + (handler,)
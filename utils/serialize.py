@@ -0,0 +1,75 @@
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """序列化带 to_dict 的对象（如 crawlers.order.Order）"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"无法序列化 {type(obj).__name__}")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    紧凑的 UTF-8 JSON，安装了 orjson 时使用 orjson
+
+    Args:
+        obj: 要序列化的对象
+        sort_keys: 按键排序，内容相同的字典得到相同的字节（用于计算内容哈希）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys,
+                      default=_default).encode('utf-8')
+
+
+def dumps_str(obj: Any) -> str:
+    """同 dumps，返回 str，用于 SQLite 的 TEXT 列"""
+    return dumps(obj).decode('utf-8')
+
+
+def loads(data) -> Any:
+    """解析 JSON，接受 bytes 或 str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def append_jsonl(path: str, records: Iterable[Any]) -> int:
+    """
+    以 JSON Lines 格式追加写入，每条记录一行
+
+    Returns:
+        写入的条数
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(path, 'ab') as f:
+        for record in records:
+            f.write(dumps(record))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """逐行读取 JSON Lines 文件，跳过空行和写入中断留下的不完整末行"""
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                if f.read(1):
+                    raise
@@ -0,0 +1,36 @@
+import logging
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QPlainTextEdit
+
+from utils.log import LOG_FORMAT
+
+
+class _LogSignal(QObject):
+    message = Signal(str)
+
+
+class QtLogHandler(logging.Handler):
+    """把日志通过信号转发到界面线程"""
+
+    def __init__(self, level=logging.INFO):
+        super().__init__(level)
+        self.bridge = _LogSignal()
+        self.setFormatter(logging.Formatter(LOG_FORMAT, "%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            self.bridge.message.emit(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class LogPaneWidget(QPlainTextEdit):
+    """只读日志面板，最多保留 max_lines 行"""
+
+    def __init__(self, parent=None, max_lines: int = 2000):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.handler = QtLogHandler()
+        self.handler.bridge.message.connect(self.appendPlainText)
@@ -1,8 +1,18 @@
+import logging
 import sys
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
+from utils.export import export_csv
+
+logger = logging.getLogger(__name__)
+
+# 导出范围
+EXPORT_ALL = "all"
+EXPORT_SELECTED = "selected"
+EXPORT_FILTERED = "filtered"
+
 
 class StyledTableWidget(QTableWidget):
     def __init__(self, parent=None):
@@ -13,6 +23,15 @@ class StyledTableWidget(QTableWidget):
         # 添加筛选功能相关属性
         self.filter_active = False
         self.filtered_rows = set()
+        # 当前生效的筛选条件 (column, pattern, match_type)，新增/更新行时按它重新筛选
+        self.filter_args = None
+
+        # 表格对应的原始数据行，导出时直接使用，不再逐个读取单元格
+        self.source_rows = []
+
+    def set_source_rows(self, rows):
+        """记录表格对应的原始数据行（与表格行一一对应）"""
+        self.source_rows = list(rows)
 
     def apply_filter(self, column, pattern, match_type="contains"):
         """应用筛选条件
@@ -25,33 +44,40 @@ class StyledTableWidget(QTableWidget):
             return
 
         self.filter_active = True
+        self.filter_args = (column, pattern, match_type)
         self.filtered_rows.clear()
 
         try:
-            import re
             for row in range(self.rowCount()):
-                show_row = False
-
-                if column == -1:  # 所有列
-                    for col in range(self.columnCount()):
-                        item = self.item(row, col)
-                        if item and self._match_item(item.text(), pattern, match_type):
-                            show_row = True
-                            break
-                else:  # 特定列
-                    item = self.item(row, column)
-                    if item and self._match_item(item.text(), pattern, match_type):
-                        show_row = True
-
-                # 根据匹配结果隐藏或显示行
-                self.setRowHidden(row, not show_row)
-                if not show_row:
-                    self.filtered_rows.add(row)
+                self._filter_row(row)
 
         except Exception as e:
             from PySide6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "筛选错误", f"筛选过程中发生错误: {str(e)}")
 
+    def _filter_row(self, row):
+        """按当前筛选条件判断单行是否显示，并同步 filtered_rows"""
+        column, pattern, match_type = self.filter_args
+        show_row = False
+
+        if column == -1:  # 所有列
+            for col in range(self.columnCount()):
+                item = self.item(row, col)
+                if item and self._match_item(item.text(), pattern, match_type):
+                    show_row = True
+                    break
+        else:  # 特定列
+            item = self.item(row, column)
+            if item and self._match_item(item.text(), pattern, match_type):
+                show_row = True
+
+        # 根据匹配结果隐藏或显示行
+        self.setRowHidden(row, not show_row)
+        if show_row:
+            self.filtered_rows.discard(row)
+        else:
+            self.filtered_rows.add(row)
+
     def _match_item(self, text, pattern, match_type):
         """匹配单个单元格文本"""
         try:
@@ -69,6 +95,7 @@ class StyledTableWidget(QTableWidget):
     def clear_filter(self):
         """清除筛选，显示所有行"""
         self.filter_active = False
+        self.filter_args = None
         self.filtered_rows.clear()
 
         # 显示所有行
@@ -80,6 +107,8 @@ class StyledTableWidget(QTableWidget):
         self.setAlternatingRowColors(True)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # 表格只读：导出时按行号取 source_rows，单元格被编辑后两者会不一致
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.horizontalHeader().setStretchLastSection(True)
         self.verticalHeader().setVisible(False)
 
@@ -95,10 +124,9 @@ class StyledTableWidget(QTableWidget):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
 
-        # 启用拖拽
+        # 只允许把内容拖出表格，不接受放入，避免行被移动或覆盖后与 source_rows 错位
         self.setDragEnabled(True)
-        self.setAcceptDrops(True)
-        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.DragOnly)
 
     def show_context_menu(self, position):
         """显示右键菜单"""
@@ -143,10 +171,13 @@ class StyledTableWidget(QTableWidget):
         # 删除所有选中的行
         for row in rows_to_delete:
             self.removeRow(row)
+            if row < len(self.source_rows):
+                del self.source_rows[row]
 
     def clear_table(self):
         """清空表格"""
         self.setRowCount(0)
+        self.source_rows = []
 
     def get_selected_data(self):
         """获取所有选中行的数据"""
@@ -180,56 +211,135 @@ class StyledTableWidget(QTableWidget):
         for col, value in enumerate(data):
             self.setItem(row, col, QTableWidgetItem(str(value)))
 
+    def append_rows(self, rows):
+        """在表格末尾批量追加数据行，同时追加原始数据"""
+        start = self.rowCount()
+        self.setUpdatesEnabled(False)
+        try:
+            self.setRowCount(start + len(rows))
+            for offset, values in enumerate(rows):
+                for col, value in enumerate(values):
+                    item = QTableWidgetItem(str(value))
+                    item.setToolTip(item.text())
+                    self.setItem(start + offset, col, item)
+            if self.filter_active:
+                for row in range(start, start + len(rows)):
+                    self._filter_row(row)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.source_rows.extend(rows)
+
+    def upsert_rows(self, rows, key_column=0):
+        """
+        按主键列增量更新表格：已有的行只改动变化的单元格，新行插入到表格顶部
+
+        Args:
+            rows: 数据行列表
+            key_column: 主键所在列
+
+        Returns:
+            (更新的行数, 新增的行数)
+        """
+        index = {}
+        for row in range(self.rowCount()):
+            item = self.item(row, key_column)
+            if item:
+                index[item.text()] = row
+        in_sync = len(self.source_rows) == self.rowCount()
+
+        updated = 0
+        updated_rows = []
+        new_rows = []
+        for values in rows:
+            row = index.get(str(values[key_column]))
+            if row is None:
+                new_rows.append(values)
+                continue
+            for col, value in enumerate(values):
+                text = str(value)
+                item = self.item(row, col)
+                if item is None or item.text() != text:
+                    item = QTableWidgetItem(text)
+                    item.setToolTip(text)
+                    self.setItem(row, col, item)
+            if in_sync:
+                self.source_rows[row] = values
+            updated_rows.append(row)
+            updated += 1
+
+        for values in reversed(new_rows):
+            self.insertRow(0)
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setToolTip(item.text())
+                self.setItem(0, col, item)
+            if in_sync:
+                self.source_rows.insert(0, values)
+
+        if self.filter_active:
+            # 新行插在顶部，已筛掉的行号整体后移，再对变化的行重新筛选
+            shift = len(new_rows)
+            self.filtered_rows = {row + shift for row in self.filtered_rows}
+            for row in list(range(shift)) + [row + shift for row in updated_rows]:
+                self._filter_row(row)
+        return updated, len(new_rows)
+
+    def header_labels(self):
+        """当前表头文字"""
+        headers = []
+        for col in range(self.columnCount()):
+            header = self.horizontalHeaderItem(col)
+            headers.append(header.text() if header else f"Column {col}")
+        return headers
+
+    def get_export_rows(self, scope=EXPORT_ALL):
+        """
+        获取要导出的数据行
+
+        Args:
+            scope: EXPORT_ALL 全部行，EXPORT_SELECTED 选中行，EXPORT_FILTERED 筛选后可见的行
+
+        Returns:
+            数据行列表
+        """
+        if scope == EXPORT_SELECTED:
+            rows = set()
+            for selected_range in self.selectedRanges():
+                rows.update(range(selected_range.topRow(), selected_range.bottomRow() + 1))
+            rows = sorted(rows)
+        elif scope == EXPORT_FILTERED:
+            rows = [row for row in range(self.rowCount()) if not self.isRowHidden(row)]
+        else:
+            rows = range(self.rowCount())
+
+        # 原始数据与表格同步时直接取原始数据
+        if len(self.source_rows) == self.rowCount():
+            return [self.source_rows[row] for row in rows]
+
+        result = []
+        for row in rows:
+            values = []
+            for col in range(self.columnCount()):
+                item = self.item(row, col)
+                values.append(item.text() if item else "")
+            result.append(values)
+        return result
+
     def export_to_csv(self, filename, export_selected_only=True):
         """导出到CSV文件
         Args:
             filename: 导出文件名
             export_selected_only: 是否只导出选中行，False则导出所有行
         """
-        print(f"导出路径:{filename}")
-        try:
-            with open(filename, 'w', encoding='utf-8') as file:
-                # 写入表头
-                # headers = []
-                # for col in range(self.columnCount()):
-                #     header = self.horizontalHeaderItem(col)
-                #     headers.append(header.text() if header else f"Column {col}")
-                # file.write(','.join(headers) + '\n')
-
-                # 确定要导出的行范围
-                if export_selected_only:
-                    # 只导出选中行
-                    selected_ranges = self.selectedRanges()
-                    if not selected_ranges:
-                        print("没有选中的行可导出")
-                        return False
-
-                    rows_to_export = set()
-                    for selected_range in selected_ranges:
-                        for row in range(selected_range.topRow(), selected_range.bottomRow() + 1):
-                            rows_to_export.add(row)
-                    rows_to_export = sorted(rows_to_export)
-                else:
-                    # 导出所有行
-                    rows_to_export = range(self.rowCount())
-
-                # 写入数据
-                export_count = 0
-                for row in rows_to_export:
-                    row_data = []
-                    for col in range(self.columnCount()):
-                        item = self.item(row, col)
-                        # 处理包含逗号的内容，用引号包围
-                        text = item.text() if item else ""
-                        if ',' in text:
-                            text = f'"{text}"'
-                        row_data.append(text)
-                    file.write(','.join(row_data) + '\n')
-                    export_count += 1
-
-                print(f"成功导出 {export_count} 行数据")
-                return True
+        logger.info("导出路径: %s", filename)
+        rows = self.get_export_rows(EXPORT_SELECTED if export_selected_only else EXPORT_ALL)
+        if not rows:
+            logger.info("没有可导出的行")
+            return False
 
+        try:
+            export_csv(filename, self.header_labels(), rows)
+            return True
         except Exception as e:
-            print(f"导出失败: {e}")
+            logger.error("导出失败: %s", e)
             return False
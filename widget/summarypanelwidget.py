@@ -0,0 +1,41 @@
+from html import escape
+
+from PySide6.QtWidgets import QTextBrowser
+
+
+class SummaryPanelWidget(QTextBrowser):
+    """消费统计面板"""
+
+    # 每个分组最多显示的行数
+    MAX_ROWS = 12
+
+    SECTIONS = [
+        ('by_month', '按月份'),
+        ('by_category', '按分类'),
+        ('by_shop', '按店铺'),
+        ('by_payment', '按支付方式'),
+        ('by_status', '按订单状态'),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setOpenLinks(False)
+
+    def show_summary(self, summary):
+        """
+        显示统计结果
+
+        Args:
+            summary: SpendingAnalytics.summary() 的返回值
+        """
+        html = [f"<h3>共 {summary['orders']} 个订单，合计 ¥{summary['total']:,.2f}</h3>"]
+        for key, title in self.SECTIONS:
+            series = summary[key]
+            if series.empty:
+                continue
+            html.append(f"<b>{title}</b><table cellspacing='0' cellpadding='2'>")
+            for label, amount in series.head(self.MAX_ROWS).items():
+                # 店铺名、分类等来自页面内容，转义后再放入 HTML
+                html.append(f"<tr><td>{escape(str(label))}</td><td align='right'>¥{amount:,.2f}</td></tr>")
+            html.append("</table><br>")
+        self.setHtml("".join(html))